@@ -5,23 +5,36 @@ Clusters content items by semantic similarity using KMeans on their
 embeddings, then labels each cluster using Claude Haiku.
 
 Algorithm:
+  Embeddings are L2-normalized (cosine geometry); spherical FAISS KMeans when
+  faiss is installed, scikit-learn KMeans otherwise.
   k = max(3, min(12, round(sqrt(n / 2))))
-  Validate with silhouette score; reduce k or collapse to 1 if quality < 0.15.
+  Validate with silhouette score (n >= 30 only); merge centroids down to k=2
+  or collapse to 1 if quality < 0.15.
   Label via Claude Haiku prompt: 5 sample titles → 2-4 word Italian label.
 """
 
 import asyncio
+import hashlib
 import logging
 import math
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 
 import anthropic
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
 
 from config import settings
 
+try:
+    # Optional — spherical KMeans with SIMD inner-product kernels.
+    # Falls back to scikit-learn when not installed.
+    import faiss  # type: ignore[import-untyped]
+except ImportError:
+    faiss = None
+
 logger = logging.getLogger(__name__)
 
 # ─── Constants ────────────────────────────────────────────────────────────────
@@ -30,17 +43,25 @@ _MODEL = "claude-haiku-4-5-20251001"
 _MIN_ITEMS = 6
 _MIN_SILHOUETTE = 0.15
 _MAX_RETRIES = 3
+_MINIBATCH_THRESHOLD = 2_000   # above this many items, use MiniBatchKMeans
+_SILHOUETTE_SAMPLE = 500       # silhouette is O(n²) — score on a fixed sample
+_SILHOUETTE_MIN_ITEMS = 30     # below this, trust the heuristic k as-is
+_LABEL_CONCURRENCY = 5         # max in-flight labeling requests
+_LABEL_BURST = 10              # token-bucket capacity for labeling requests
+_LABEL_CACHE_SIZE = 1_024      # distinct title sets remembered per process
+_FIT_CACHE_SIZE = 64           # distinct embedding matrices remembered
+
+_PROMPT_HEAD = "Questi sono i titoli di contenuti simili per argomento:\n"
+_PROMPT_TAIL = (
+    "\n\n"
+    "Rispondi con un'etichetta tematica di 2-4 parole in italiano che riassuma "
+    "l'argomento principale di questo gruppo. Solo l'etichetta, nient'altro."
+)
 
 
 # ─── Data classes ─────────────────────────────────────────────────────────────
 
 
-@dataclass
-class ClusterItem:
-    id: str
-    embedding: list[float]
-
-
 @dataclass
 class ClusterAssignment:
     id: str
@@ -56,6 +77,99 @@ class ClusterResult:
     error: str | None = None
 
 
+# ─── Shared client ────────────────────────────────────────────────────────────
+
+# One connection pool for every TopicClusterer in the process.
+_client: anthropic.AsyncAnthropic | None = None
+
+
+def _get_client() -> anthropic.AsyncAnthropic:
+    global _client
+    if _client is None:
+        _client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
+    return _client
+
+
+# ─── Rate limiting ────────────────────────────────────────────────────────────
+
+
+class _AdaptiveLimiter:
+    """
+    Concurrency cap plus an AIMD-tuned token bucket for Anthropic calls.
+
+    The refill rate halves on every 429 (multiplicative decrease) and grows
+    by a fixed step on each success (additive increase), never exceeding the
+    configured requests-per-minute budget.
+    """
+
+    def __init__(self, rpm: float, concurrency: int, burst: int) -> None:
+        self._max_rate = rpm / 60.0
+        self._min_rate = self._max_rate / 16
+        self._step = self._max_rate / 10
+        self._rate = self._max_rate
+        self._burst = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._sem = asyncio.Semaphore(concurrency)
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._sem:
+            await self._acquire()
+            yield
+
+    async def _acquire(self) -> None:
+        # Held across the sleep so waiters are served in order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._burst, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self._rate)
+
+    def on_success(self) -> None:
+        self._rate = min(self._max_rate, self._rate + self._step)
+
+    def on_rate_limited(self) -> None:
+        self._rate = max(self._min_rate, self._rate / 2)
+        self._tokens = 0.0  # stop the current burst
+
+
+_limiter = _AdaptiveLimiter(
+    rpm=settings.anthropic_rpm, concurrency=_LABEL_CONCURRENCY, burst=_LABEL_BURST
+)
+
+
+# Title set → label (None while in flight or after a failure)
+_label_cache: "OrderedDict[frozenset[str], asyncio.Future[str | None]]" = OrderedDict()
+
+
+# Normalized-matrix digest → (labels, centroids, silhouette, k)
+_fit_cache: "OrderedDict[bytes, asyncio.Task[tuple]]" = OrderedDict()
+
+
+def _evict_failed_fit(key: bytes, task: "asyncio.Task[tuple]") -> None:
+    # Don't cache failures; retrieving the exception also silences the
+    # "never retrieved" warning (awaiting callers re-raise it themselves)
+    failed = task.cancelled() or task.exception() is not None
+    if failed and _fit_cache.get(key) is task:
+        del _fit_cache[key]
+
+
+def _retry_after(exc: anthropic.RateLimitError) -> float | None:
+    """Seconds from the Retry-After header, if the server sent one."""
+    try:
+        return float(exc.response.headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
+
+
 # ─── Agent ────────────────────────────────────────────────────────────────────
 
 
@@ -65,17 +179,10 @@ class TopicClusterer:
 
     KMeans is CPU-bound; it runs in the default thread executor to avoid
     blocking the async event loop. Claude Haiku labeling runs concurrently
-    for all clusters after KMeans finishes.
+    for all clusters after KMeans finishes, throttled by a process-wide
+    adaptive rate limiter.
     """
 
-    def __init__(self) -> None:
-        self._client: anthropic.AsyncAnthropic | None = None
-
-    def _get_client(self) -> anthropic.AsyncAnthropic:
-        if self._client is None:
-            self._client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
-        return self._client
-
     def is_configured(self) -> bool:
         return bool(settings.anthropic_api_key)
 
@@ -90,71 +197,315 @@ class TopicClusterer:
         "np.ndarray[float, np.dtype[np.float32]]",
         float,
     ]:
-        """Return (labels, centroids, silhouette_score)."""
-        km = KMeans(n_clusters=k, n_init=10, random_state=42)
-        labels = km.fit_predict(embeddings)
-        centers: "np.ndarray[float, np.dtype[np.float32]]" = km.cluster_centers_
+        """
+        Return (labels, centroids, silhouette_score).
 
-        sil = 0.0
-        if k > 1 and len(set(labels.tolist())) > 1:
-            sample = min(1_000, len(embeddings))
-            sil = float(silhouette_score(embeddings, labels, sample_size=sample))
+        Below _SILHOUETTE_MIN_ITEMS the silhouette is too noisy to act on, so
+        it is not computed and the score is reported as 1.0.
+        """
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        n = len(embeddings)
+        if faiss is not None:
+            labels, centers = self._fit_faiss(embeddings, k)
+        else:
+            labels, centers = self._fit_sklearn(embeddings, k)
+
+        if n < _SILHOUETTE_MIN_ITEMS or k == 1:
+            return labels, centers, 1.0
+        return labels, centers, self._silhouette(embeddings, labels, k)
+
+    def _fit_sklearn(
+        self,
+        embeddings: "np.ndarray[float, np.dtype[np.float32]]",
+        k: int,
+    ) -> tuple[
+        "np.ndarray[int, np.dtype[np.int32]]",
+        "np.ndarray[float, np.dtype[np.float32]]",
+    ]:
+        # scikit-learn takes most of the engine's import time — load it on
+        # first fit (or during startup warmup), not when the router loads
+        from sklearn.cluster import KMeans, MiniBatchKMeans
+
+        km: KMeans | MiniBatchKMeans
+        if len(embeddings) > _MINIBATCH_THRESHOLD:
+            km = MiniBatchKMeans(
+                n_clusters=k, n_init=3, batch_size=1024, random_state=42
+            )
+        else:
+            # A single k-means++ init is sufficient at this size; elkan skips
+            # distance computations via the triangle inequality.
+            km = KMeans(
+                n_clusters=k,
+                n_init=1,
+                init="k-means++",
+                algorithm="elkan",
+                random_state=42,
+            )
+        km.fit(embeddings)
+        return km.labels_, km.cluster_centers_
 
-        return labels, centers, sil
+    def _fit_faiss(
+        self,
+        embeddings: "np.ndarray[float, np.dtype[np.float32]]",
+        k: int,
+    ) -> tuple[
+        "np.ndarray[int, np.dtype[np.int32]]",
+        "np.ndarray[float, np.dtype[np.float32]]",
+    ]:
+        """
+        Spherical KMeans via FAISS. Expects L2-normalized rows.
+
+        Seeded with k-means++ centroids: FAISS's default random init with a
+        single run regularly merges well-separated clusters on small corpora.
+        """
+        from sklearn.cluster import kmeans_plusplus
+
+        init, _ = kmeans_plusplus(embeddings, k, random_state=42)
+        km = faiss.Kmeans(
+            embeddings.shape[1],
+            k,
+            niter=20,
+            spherical=True,
+            seed=42,
+            verbose=False,
+            # Small corpora are the norm here — don't warn about n < 39·k
+            min_points_per_centroid=1,
+        )
+        km.train(embeddings, init_centroids=init)
+        _, nearest = km.index.search(embeddings, 1)
+        return nearest.ravel().astype(np.int32), km.centroids
+
+    def _silhouette(
+        self,
+        embeddings: "np.ndarray[float, np.dtype[np.float32]]",
+        labels: "np.ndarray[int, np.dtype[np.int32]]",
+        k: int,
+    ) -> float:
+        """
+        Mean silhouette coefficient over a fixed random sample.
+
+        Same definition as sklearn.metrics.silhouette_score, computed with one
+        pairwise-distance GEMM and one-hot reductions instead of sklearn's
+        chunked generic machinery (the sample is at most a few hundred rows).
+        """
+        if k <= 1 or len(np.unique(labels)) <= 1:
+            return 0.0
+
+        n = len(embeddings)
+        if n > _SILHOUETTE_SAMPLE:
+            idx = np.random.default_rng(42).choice(n, _SILHOUETTE_SAMPLE, replace=False)
+            x = embeddings[idx].astype(np.float64)
+            lab = labels[idx]
+        else:
+            x = embeddings.astype(np.float64)
+            lab = labels
+        if len(np.unique(lab)) <= 1:
+            return 0.0
+
+        m = len(x)
+        sq = np.einsum("ij,ij->i", x, x)
+        dists = np.sqrt(np.maximum(sq[:, None] + sq[None, :] - 2.0 * (x @ x.T), 0.0))
+        np.fill_diagonal(dists, 0.0)
+
+        onehot = np.zeros((m, k))
+        onehot[np.arange(m), lab] = 1.0
+        sums = dists @ onehot                     # (m, k) distance sum per cluster
+        counts = onehot.sum(axis=0)               # (k,)
+        own = counts[lab]
+
+        # a: mean distance to the rest of the point's own cluster
+        a = sums[np.arange(m), lab] / np.maximum(own - 1.0, 1.0)
+        # b: mean distance to the nearest other (non-empty) cluster
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = sums / counts
+        means[:, counts == 0] = np.inf
+        means[np.arange(m), lab] = np.inf
+        b = means.min(axis=1)
+
+        denom = np.maximum(a, b)
+        sil = np.where(denom > 0, (b - a) / np.where(denom > 0, denom, 1.0), 0.0)
+        sil[own == 1] = 0.0  # singleton clusters score 0 by convention
+        return float(sil.mean())
+
+    def _merge_to_two(
+        self,
+        embeddings: "np.ndarray[float, np.dtype[np.float32]]",
+        labels: "np.ndarray[int, np.dtype[np.int32]]",
+        centers: "np.ndarray[float, np.dtype[np.float32]]",
+    ) -> tuple[
+        "np.ndarray[int, np.dtype[np.int32]]",
+        "np.ndarray[float, np.dtype[np.float32]]",
+        float,
+    ]:
+        """
+        Coarsen an existing k-cluster solution to k=2.
+
+        Runs 2-means on the k centroids (weighted by cluster size) instead of
+        re-fitting the full matrix, then maps every item through its centroid.
+        Return (labels, centroids, silhouette_score).
+        """
+        from sklearn.cluster import KMeans
+
+        sizes = np.bincount(labels, minlength=len(centers))
+        macro = KMeans(n_clusters=2, n_init=1, random_state=42)
+        macro.fit(centers, sample_weight=sizes)
+        labels2 = macro.labels_.astype(np.int32)[labels]
+
+        if len(np.unique(labels2)) < 2:
+            return labels2, centers[:1], 0.0
+
+        centers2 = np.stack(
+            [embeddings[labels2 == c].mean(axis=0) for c in range(2)]
+        ).astype(np.float32)
+        return labels2, centers2, self._silhouette(embeddings, labels2, 2)
+
+    # ── Fit (async wrapper, shared across requests) ───────────────────────────
+
+    async def _fit_shared(
+        self, mat: "np.ndarray[float, np.dtype[np.float32]]"
+    ) -> tuple[
+        "np.ndarray[int, np.dtype[np.int32]]",
+        "np.ndarray[float, np.dtype[np.float32]]",
+        float,
+        int,
+    ]:
+        """
+        `_fit` keyed on a digest of the normalized matrix: repeated or
+        concurrent /topics calls over the same corpus share one KMeans run.
+        The fit is deterministic (fixed seeds), so reuse never changes results.
+        """
+        key = hashlib.blake2b(mat.data, digest_size=16).digest()
+        task = _fit_cache.get(key)
+        if task is not None:
+            _fit_cache.move_to_end(key)
+        else:
+            # The fit is its own task: a caller that goes away (client
+            # disconnect) stops waiting but never cancels it for the others
+            task = asyncio.ensure_future(self._fit(mat))
+            _fit_cache[key] = task
+            task.add_done_callback(lambda t: _evict_failed_fit(key, t))
+            while len(_fit_cache) > _FIT_CACHE_SIZE:
+                _fit_cache.popitem(last=False)
+        return await asyncio.shield(task)
+
+    async def _fit(
+        self, mat: "np.ndarray[float, np.dtype[np.float32]]"
+    ) -> tuple[
+        "np.ndarray[int, np.dtype[np.int32]]",
+        "np.ndarray[float, np.dtype[np.float32]]",
+        float,
+        int,
+    ]:
+        """Return (labels, centroids, silhouette_score, k) for normalized rows."""
+        n = len(mat)
+
+        # ── Compute k ─────────────────────────────────────────────────────────
+        k = max(3, min(12, round(math.sqrt(n / 2))))
+
+        loop = asyncio.get_running_loop()
+        labels, centers, sil = await loop.run_in_executor(
+            None, self._fit_kmeans, mat, k
+        )
+
+        # ── Silhouette check: merge to k=2 if quality is poor ─────────────────
+        if n >= _SILHOUETTE_MIN_ITEMS and sil < _MIN_SILHOUETTE and k > 2:
+            labels2, centers2, sil2 = await loop.run_in_executor(
+                None, self._merge_to_two, mat, labels, centers
+            )
+            if sil2 >= _MIN_SILHOUETTE:
+                labels, centers, sil, k = labels2, centers2, sil2, 2
+            else:
+                # Collapse to one cluster
+                labels = np.zeros(n, dtype=np.int32)
+                centers = mat.mean(axis=0, keepdims=True).astype(np.float32)
+                k = 1
+
+        return labels, centers, sil, k
 
     # ── Cluster labeling (async) ───────────────────────────────────────────────
 
     async def _label_cluster(self, cluster_idx: int, sample_titles: list[str]) -> str:
         """Generate a 2-4 word Italian label for one cluster."""
+        fallback = f"Cluster {cluster_idx + 1}"
         if not self.is_configured():
-            return f"Cluster {cluster_idx + 1}"
-
-        client = self._get_client()
+            return fallback
+
+        # Identical title sets share one LLM call — whether they arrive
+        # concurrently or in a later run within the same process.
+        key = frozenset(sample_titles[:5])
+        fut = _label_cache.get(key)
+        if fut is not None:
+            _label_cache.move_to_end(key)
+            return await asyncio.shield(fut) or fallback
+
+        fut = asyncio.get_running_loop().create_future()
+        _label_cache[key] = fut
+        while len(_label_cache) > _LABEL_CACHE_SIZE:
+            _label_cache.popitem(last=False)
+
+        label: str | None = None
+        try:
+            label = await self._request_label(cluster_idx, sample_titles)
+        finally:
+            if label is None and _label_cache.get(key) is fut:
+                del _label_cache[key]  # don't cache failures
+            fut.set_result(label)
+        return label or fallback
+
+    async def _request_label(
+        self, cluster_idx: int, sample_titles: list[str]
+    ) -> str | None:
+        """Call Claude Haiku for a label. Returns None on failure."""
+        client = _get_client()
         bullet_list = "\n".join(f"- {t}" for t in sample_titles[:5])
-        prompt = (
-            f"Questi sono i titoli di contenuti simili per argomento:\n{bullet_list}\n\n"
-            "Rispondi con un'etichetta tematica di 2-4 parole in italiano che riassuma "
-            "l'argomento principale di questo gruppo. Solo l'etichetta, nient'altro."
-        )
+        prompt = _PROMPT_HEAD + bullet_list + _PROMPT_TAIL
 
         for attempt in range(_MAX_RETRIES):
             try:
-                response = await client.messages.create(
-                    model=_MODEL,
-                    max_tokens=32,
-                    messages=[{"role": "user", "content": prompt}],
-                )
+                async with _limiter.slot():
+                    response = await client.messages.create(
+                        model=_MODEL,
+                        max_tokens=32,
+                        messages=[{"role": "user", "content": prompt}],
+                    )
+                _limiter.on_success()
                 raw = response.content[0].text.strip().strip("\"'").strip()
-                return raw[:60] if raw else f"Cluster {cluster_idx + 1}"
-            except anthropic.RateLimitError:
-                wait = 2**attempt
+                return raw[:60] or None
+            except anthropic.RateLimitError as exc:
+                _limiter.on_rate_limited()
+                retry_after = _retry_after(exc)
+                wait = retry_after if retry_after is not None else 2**attempt
                 if attempt < _MAX_RETRIES - 1:
                     await asyncio.sleep(wait)
                     continue
-                return f"Cluster {cluster_idx + 1}"
+                return None
             except Exception as exc:
                 logger.warning(
                     "Label generation for cluster %d failed: %s", cluster_idx, exc
                 )
-                return f"Cluster {cluster_idx + 1}"
+                return None
 
-        return f"Cluster {cluster_idx + 1}"
+        return None
 
     # ── Main entry point ──────────────────────────────────────────────────────
 
     async def cluster(
         self,
-        items: list[ClusterItem],
+        ids: list[str],
+        embeddings: "np.ndarray[float, np.dtype[np.float32]]",
         titles: dict[str, str],
     ) -> ClusterResult:
         """
         Cluster items by embedding and label each cluster.
 
         Args:
-            items:  list of ClusterItem (id, embedding)
-            titles: {item_id: title} — used for LLM cluster labeling
+            ids:        item ids, one per embedding row
+            embeddings: (n, d) matrix, row i belonging to ids[i]. A C-contiguous
+                        float32 array is used as-is (no copy) and its rows are
+                        L2-normalized in place.
+            titles:     {item_id: title} — used for LLM cluster labeling
         """
-        n = len(items)
+        n = len(ids)
 
         if n < _MIN_ITEMS:
             return ClusterResult(
@@ -164,35 +515,24 @@ class TopicClusterer:
                 )
             )
 
-        mat = np.array([item.embedding for item in items], dtype=np.float32)
-
-        # ── Compute k ─────────────────────────────────────────────────────────
-        k = max(3, min(12, round(math.sqrt(n / 2))))
-
-        loop = asyncio.get_event_loop()
-        labels, centers, sil = await loop.run_in_executor(
-            None, self._fit_kmeans, mat, k
-        )
+        # KMeans, silhouette and the row-wise distance pass below all expect
+        # a C-contiguous float32 matrix; callers normally hand one over.
+        mat = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if mat.ndim != 2 or len(mat) != n:
+            return ClusterResult(error="Embeddings must be an (n_items, dim) matrix")
 
-        # ── Silhouette check: try k=2 if quality is poor ──────────────────────
-        if sil < _MIN_SILHOUETTE and k > 2:
-            labels2, centers2, sil2 = await loop.run_in_executor(
-                None, self._fit_kmeans, mat, 2
-            )
-            if sil2 >= _MIN_SILHOUETTE:
-                labels, centers, sil, k = labels2, centers2, sil2, 2
-            else:
-                # Collapse to one cluster
-                labels = np.zeros(n, dtype=np.int32)
-                centers = mat.mean(axis=0, keepdims=True).astype(np.float32)
-                k = 1
+        # L2-normalize rows in place so Euclidean KMeans ranks neighbours the
+        # same way cosine similarity does (what the embeddings are built for).
+        norms = np.linalg.norm(mat, axis=1, keepdims=True)
+        np.divide(mat, norms, out=mat, where=norms > 0)
 
+        labels, centers, sil, k = await self._fit_shared(mat)
         logger.info("Clusters: k=%d, silhouette=%.3f, n=%d", k, sil, n)
 
         # ── Build sample titles per cluster ───────────────────────────────────
         cluster_titles: dict[int, list[str]] = {i: [] for i in range(k)}
-        for item, cidx in zip(items, labels.tolist()):
-            title = titles.get(item.id, "")
+        for item_id, cidx in zip(ids, labels.tolist()):
+            title = titles.get(item_id, "")
             if title:
                 cluster_titles[int(cidx)].append(title)
 
@@ -204,28 +544,24 @@ class TopicClusterer:
         cluster_labels: list[str] = list(await asyncio.gather(*label_coros))
 
         # ── Build assignments with confidence ─────────────────────────────────
-        assignments: list[ClusterAssignment] = []
-        for item, cidx_raw in zip(items, labels.tolist()):
-            cidx = int(cidx_raw)
-            vec = np.array(item.embedding, dtype=np.float32)
-            dist = float(np.linalg.norm(vec - centers[cidx]))
-
-            cluster_mask = labels == cidx
-            cluster_vecs = mat[cluster_mask]
-            dists = np.linalg.norm(cluster_vecs - centers[cidx], axis=1)
-            max_dist = float(dists.max()) if len(dists) > 0 else 1.0
-            confidence = round(
-                max(0.0, min(1.0, 1.0 - dist / max_dist)) if max_dist > 0 else 1.0,
-                4,
-            )
-
-            assignments.append(
-                ClusterAssignment(
-                    id=item.id,
-                    cluster_idx=cidx,
-                    topic_label=cluster_labels[cidx],
-                    confidence=confidence,
-                )
+        # Distance of each item to its own centroid, normalised by the farthest
+        # member of the same cluster — computed in one vectorized pass.
+        labels = np.asarray(labels, dtype=np.int32)
+        diffs = mat - centers[labels]
+        all_dists = np.sqrt(np.einsum("ij,ij->i", diffs, diffs))
+        max_per_cluster = np.zeros(k, dtype=np.float64)
+        np.maximum.at(max_per_cluster, labels, all_dists)
+        denom = np.where(max_per_cluster > 0, max_per_cluster, 1.0)[labels]
+        confidences = np.clip(1.0 - all_dists / denom, 0.0, 1.0).round(4)
+
+        assignments = [
+            ClusterAssignment(
+                id=item_id,
+                cluster_idx=cidx,
+                topic_label=cluster_labels[cidx],
+                confidence=conf,
             )
+            for item_id, cidx, conf in zip(ids, labels.tolist(), confidences.tolist())
+        ]
 
         return ClusterResult(assignments=assignments, clusters_found=k)
@@ -8,11 +8,18 @@ and returns structured page data for storage by the caller.
 import asyncio
 import re
 import time
-from dataclasses import dataclass, field
-from urllib.parse import urljoin, urlparse, urlunparse
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from urllib.parse import ParseResult, parse_qsl, urlencode, urljoin, urlparse, urlunparse
 
 import httpx
 from bs4 import BeautifulSoup, Tag
+from lxml import etree
+from lxml import html as lxml_html
+
+from config import settings
 
 # ─── Constants ────────────────────────────────────────────────────────────────
 
@@ -21,6 +28,12 @@ USER_AGENT = (
     "contact: bot@visiblee.com)"
 )
 
+_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "it,en;q=0.9",
+}
+
 # Tags whose entire subtree is noise
 _NOISE_TAGS = frozenset(
     {
@@ -48,6 +61,35 @@ _NOISE_PATTERN = re.compile(
     re.IGNORECASE,
 )
 
+# Main content container candidates (matched against id / class)
+_MAIN_ID_PATTERN = re.compile(r"(content|main|article|post|body)", re.IGNORECASE)
+_MAIN_CLASS_PATTERN = re.compile(r"(content|main|article|post|entry)", re.IGNORECASE)
+
+# Meta tags checked in priority order, as (attribute, value) pairs
+_TITLE_META = [("property", "og:title"), ("name", "twitter:title")]
+_DESCRIPTION_META = [
+    ("property", "og:description"),
+    ("name", "description"),
+    ("name", "twitter:description"),
+]
+_PUBLISHED_META = [
+    ("property", "article:published_time"),
+    ("property", "og:article:published_time"),
+    ("name", "date"),
+    ("name", "pubdate"),
+    ("name", "DC.date"),
+    ("itemprop", "datePublished"),
+]
+
+# Decoded text is re-encoded as UTF-8, so in-document charset declarations
+# must not override it.
+_LXML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+_LX_CLASS_OR_ID = etree.XPath("//*[@class or @id]")
+
+# Max HTML bytes read per page — the rest of the body is never downloaded
+_MAX_HTML_BYTES = 1_000_000
+_READ_CHUNK_BYTES = 64 * 1024
+
 # Max raw_content length to store (characters)
 _MAX_CONTENT_CHARS = 100_000
 
@@ -95,15 +137,26 @@ class CrawlerAgent:
     """
     Async BFS crawler.
 
+    Pages are fetched one BFS level at a time, up to `concurrency` requests
+    in flight; the global rate limit is still enforced across all of them.
+
     Args:
-        rate_limit: Max requests per second (across the whole crawl).
-        timeout:    Per-request timeout in seconds.
+        rate_limit:  Max requests per second (across the whole crawl).
+        timeout:     Per-request timeout in seconds.
+        concurrency: Max concurrent in-flight requests.
     """
 
-    def __init__(self, rate_limit: float = 1.0, timeout: float = 15.0) -> None:
+    def __init__(
+        self,
+        rate_limit: float = 1.0,
+        timeout: float = 15.0,
+        concurrency: int = 5,
+    ) -> None:
         self._interval = 1.0 / max(rate_limit, 0.1)
         self._timeout = timeout
+        self._concurrency = max(1, concurrency)
         self._last_req: float = 0.0
+        self._rate_lock = asyncio.Lock()
 
     async def crawl(
         self,
@@ -112,55 +165,87 @@ class CrawlerAgent:
         max_pages: int = 50,
     ) -> CrawlResult:
         result = CrawlResult()
+        async for url, page_data, error in self.crawl_stream(
+            start_url, max_depth=max_depth, max_pages=max_pages
+        ):
+            if error:
+                result.errors.append({"url": url, "error": error})
+                result.error_count += 1
+            elif page_data is not None:
+                result.pages.append(page_data)
+                result.crawled_count += 1
+        return result
+
+    async def crawl_stream(
+        self,
+        start_url: str,
+        max_depth: int = 2,
+        max_pages: int = 50,
+    ) -> AsyncIterator[tuple[str, PageData | None, str | None]]:
+        """
+        Same crawl as `crawl`, yielding (url, page, None) for each page and
+        (url, None, error) for each failure as soon as its fetch batch
+        completes, so callers can forward results without holding them all.
+        """
+        crawled = 0
         visited: set[str] = set()
-        # BFS queue: (url, depth)
-        queue: list[tuple[str, int]] = [(start_url, 0)]
+        # BFS frontier for the current depth
+        frontier: list[str] = [start_url]
+        depth = 0
 
         parsed_start = urlparse(start_url)
         base_domain = parsed_start.netloc  # e.g. "example.com"
 
-        headers = {
-            "User-Agent": USER_AGENT,
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "it,en;q=0.9",
-        }
-
-        async with httpx.AsyncClient(
-            headers=headers,
-            timeout=self._timeout,
-            follow_redirects=True,
-            max_redirects=5,
-        ) as client:
-            while queue and result.crawled_count < max_pages:
-                url, depth = queue.pop(0)
-                norm = _normalize_url(url)
-
-                if norm in visited:
-                    continue
-                visited.add(norm)
-
-                await self._rate_wait()
-
-                page_data, links, error = await self._fetch_page_with_retry(client, url)
-
-                if error:
-                    result.errors.append({"url": url, "error": error})
-                    result.error_count += 1
-                    continue
-
-                if page_data:
-                    result.pages.append(page_data)
-                    result.crawled_count += 1
-
-                    # Enqueue internal links if we can still go deeper
-                    if depth < max_depth and links:
-                        for link in links:
-                            if _same_domain(link, base_domain):
-                                norm_link = _normalize_url(link)
-                                if norm_link not in visited:
-                                    queue.append((link, depth + 1))
-
-        return result
+        sem = asyncio.Semaphore(self._concurrency)
+
+        async with _make_client(self._timeout, self._concurrency) as client:
+            while frontier and crawled < max_pages:
+                level: deque[str] = deque()
+                for url in frontier:
+                    norm, _ = _classify_link(url, base_domain)
+                    if norm in visited:
+                        continue
+                    visited.add(norm)
+                    level.append(url)
+
+                next_frontier: list[str] = []
+                while level and crawled < max_pages:
+                    # Never fetch more than the remaining page budget at once
+                    budget = min(len(level), max_pages - crawled)
+                    batch = [level.popleft() for _ in range(budget)]
+                    fetched = await asyncio.gather(
+                        *(self._fetch_gated(sem, client, url) for url in batch)
+                    )
+
+                    for url, (page_data, links, error) in zip(batch, fetched):
+                        if error:
+                            yield url, None, error
+                            continue
+
+                        if page_data:
+                            crawled += 1
+                            yield url, page_data, None
+
+                            # Enqueue internal links if we can still go deeper
+                            if depth < max_depth and links:
+                                for link in links:
+                                    norm_link, same = _classify_link(link, base_domain)
+                                    if same and norm_link not in visited:
+                                        next_frontier.append(link)
+
+                frontier = next_frontier
+                depth += 1
+
+    async def _fetch_gated(
+        self,
+        sem: asyncio.Semaphore,
+        client: httpx.AsyncClient,
+        url: str,
+    ) -> tuple[PageData | None, list[str], str | None]:
+        """Fetch one URL under the concurrency semaphore and global rate limit."""
+        async with sem:
+            await self._rate_wait()
+            return await self._fetch_page_with_retry(client, url)
 
     async def _fetch_page_with_retry(
         self,
@@ -193,7 +278,18 @@ class CrawlerAgent:
         Returns (page_data, internal_links, error_message).
         """
         try:
-            resp = await client.get(url)
+            # Streamed so non-HTML/error bodies are never downloaded and
+            # oversized pages are cut off at _MAX_HTML_BYTES.
+            async with client.stream("GET", url) as resp:
+                content_type = resp.headers.get("content-type", "")
+                if "text/html" not in content_type:
+                    return None, [], None  # silently skip non-HTML
+
+                if resp.status_code >= 400:
+                    return None, [], f"HTTP {resp.status_code}"
+
+                final_url = str(resp.url)
+                html = await _read_html(resp)
         except httpx.TimeoutException:
             return None, [], "timeout"
         except httpx.TooManyRedirects:
@@ -201,34 +297,47 @@ class CrawlerAgent:
         except httpx.RequestError as exc:
             return None, [], str(exc)
 
-        content_type = resp.headers.get("content-type", "")
-        if "text/html" not in content_type:
-            return None, [], None  # silently skip non-HTML
-
-        if resp.status_code >= 400:
-            return None, [], f"HTTP {resp.status_code}"
-
-        final_url = str(resp.url)
-        html = resp.text
-
-        soup = BeautifulSoup(html, "lxml")
-        page_data = _extract_page_data(soup, final_url)
-        links = _extract_links(soup, final_url)
+        page_data, links = _parse_page(html, final_url)
 
         return page_data, links, None
 
     async def _rate_wait(self) -> None:
-        elapsed = time.monotonic() - self._last_req
-        wait = self._interval - elapsed
-        if wait > 0:
-            await asyncio.sleep(wait)
-        self._last_req = time.monotonic()
+        # The lock is held across the sleep so concurrent fetches are spaced
+        # out one interval apart rather than all waking at once.
+        async with self._rate_lock:
+            elapsed = time.monotonic() - self._last_req
+            wait = self._interval - elapsed
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_req = time.monotonic()
 
 
 # ─── Extraction helpers ───────────────────────────────────────────────────────
 
 
+def _parse_page(html: str, url: str) -> tuple[PageData, list[str]]:
+    """
+    Parse one HTML document. Returns (page_data, links).
+
+    Uses lxml directly by default; set HTML_PARSER=bs4 to fall back to the
+    BeautifulSoup implementation.
+    """
+    if settings.html_parser == "bs4":
+        soup = BeautifulSoup(html, "lxml")
+        # Links first: _extract_page_data strips noise from the soup in place
+        links = _extract_links(soup, url)
+        return _extract_page_data(soup, url), links
+
+    root = _lx_parse(html)
+    links = _lx_extract_links(root, url)
+    return _lx_extract_page_data(root, url), links
+
+
+# ── BeautifulSoup ─────────────────────────────────────────────────────────────
+
+
 def _extract_page_data(soup: BeautifulSoup, url: str) -> PageData:
+    """Extract metadata and main content. Mutates `soup` (noise is removed)."""
     title = _get_title(soup)
     description = _get_description(soup)
     published_at = _get_published_at(soup)
@@ -247,7 +356,7 @@ def _extract_page_data(soup: BeautifulSoup, url: str) -> PageData:
 
 
 def _get_title(soup: BeautifulSoup) -> str | None:
-    for attr, val in [("property", "og:title"), ("name", "twitter:title")]:
+    for attr, val in _TITLE_META:
         tag = soup.find("meta", attrs={attr: val})
         if tag and isinstance(tag, Tag) and tag.get("content"):
             return str(tag["content"]).strip()[:500]
@@ -261,11 +370,7 @@ def _get_title(soup: BeautifulSoup) -> str | None:
 
 
 def _get_description(soup: BeautifulSoup) -> str | None:
-    for attr, val in [
-        ("property", "og:description"),
-        ("name", "description"),
-        ("name", "twitter:description"),
-    ]:
+    for attr, val in _DESCRIPTION_META:
         tag = soup.find("meta", attrs={attr: val})
         if tag and isinstance(tag, Tag) and tag.get("content"):
             return str(tag["content"]).strip()[:500]
@@ -277,14 +382,7 @@ _DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
 
 def _get_published_at(soup: BeautifulSoup) -> str | None:
     # Check meta tags for publication date
-    for attr, val in [
-        ("property", "article:published_time"),
-        ("property", "og:article:published_time"),
-        ("name", "date"),
-        ("name", "pubdate"),
-        ("name", "DC.date"),
-        ("itemprop", "datePublished"),
-    ]:
+    for attr, val in _PUBLISHED_META:
         tag = soup.find("meta", attrs={attr: val})
         if tag and isinstance(tag, Tag) and tag.get("content"):
             raw = str(tag["content"])[:10]
@@ -305,30 +403,27 @@ def _get_main_content(soup: BeautifulSoup) -> tuple[str, int]:
     """
     Returns (raw_content_str, word_count).
 
-    Clones the soup to avoid mutating the original (needed for link extraction).
+    Decomposes noise elements in place — callers must extract links and
+    metadata before calling this.
     """
-    # Work on a copy so link extraction isn't affected
-    clone = BeautifulSoup(str(soup), "lxml")
-
-    # Remove noise tags
-    for tag in clone.find_all(_NOISE_TAGS):
-        tag.decompose()
-
-    # Remove elements whose class or id looks like noise.
+    # Remove noise tags and elements whose class or id looks like noise, in a
+    # single sweep with one regex call per tag.
     # Two-pass approach: collect first, then decompose.
     # Decomposing during iteration causes AttributeError because BeautifulSoup
     # clears __dict__ on the entire subtree, leaving child tags with attrs=None
     # while still present in the previously-generated find_all() list.
     to_remove = []
-    for tag in clone.find_all(True):
+    for tag in soup.find_all(True):
         if not isinstance(tag, Tag):
             continue
+        if tag.name in _NOISE_TAGS:
+            to_remove.append(tag)
+            continue
         attrs = getattr(tag, "attrs", None)
         if not attrs:
             continue
         classes = " ".join(attrs.get("class") or [])
-        tag_id = str(attrs.get("id") or "")
-        if _NOISE_PATTERN.search(classes) or _NOISE_PATTERN.search(tag_id):
+        if _NOISE_PATTERN.search(f"{classes} {attrs.get('id') or ''}"):
             to_remove.append(tag)
     for tag in to_remove:
         # Skip if already removed as part of a parent's subtree
@@ -337,11 +432,11 @@ def _get_main_content(soup: BeautifulSoup) -> tuple[str, int]:
 
     # Find the most likely main content container
     main = (
-        clone.find("main")
-        or clone.find("article")
-        or clone.find(id=re.compile(r"(content|main|article|post|body)", re.I))
-        or clone.find(class_=re.compile(r"(content|main|article|post|entry)", re.I))
-        or clone.find("body")
+        soup.find("main")
+        or soup.find("article")
+        or soup.find(id=_MAIN_ID_PATTERN)
+        or soup.find(class_=_MAIN_CLASS_PATTERN)
+        or soup.find("body")
     )
 
     if not main or not isinstance(main, Tag):
@@ -367,9 +462,230 @@ def _extract_links(soup: BeautifulSoup, base_url: str) -> list[str]:
     return links
 
 
+# ── lxml ──────────────────────────────────────────────────────────────────────
+
+
+def _lx_parse(html: str) -> lxml_html.HtmlElement:
+    try:
+        return lxml_html.document_fromstring(
+            html.encode("utf-8", "replace"), parser=_LXML_PARSER
+        )
+    except etree.ParserError:
+        # Empty or whitespace-only document
+        return lxml_html.document_fromstring("<html><body></body></html>")
+
+
+def _lx_extract_page_data(root: lxml_html.HtmlElement, url: str) -> PageData:
+    """Extract metadata and main content. Mutates `root` (noise is removed)."""
+    title = _lx_get_title(root)
+    description = _lx_get_meta(root, _DESCRIPTION_META)
+    published_at = _lx_get_published_at(root)
+    raw_content, word_count = _lx_get_main_content(root)
+    excerpt = raw_content[:_EXCERPT_CHARS].strip() if raw_content else None
+
+    return PageData(
+        url=url,
+        title=title or url,
+        description=description,
+        raw_content=raw_content,
+        word_count=word_count,
+        excerpt=excerpt,
+        published_at=published_at,
+    )
+
+
+def _lx_find_meta(
+    root: lxml_html.HtmlElement, attr: str, val: str
+) -> lxml_html.HtmlElement | None:
+    for tag in root.iter("meta"):
+        if tag.get(attr) == val:
+            return tag
+    return None
+
+
+def _lx_get_meta(
+    root: lxml_html.HtmlElement, candidates: list[tuple[str, str]]
+) -> str | None:
+    for attr, val in candidates:
+        tag = _lx_find_meta(root, attr, val)
+        if tag is not None and tag.get("content"):
+            return tag.get("content").strip()[:500]
+    return None
+
+
+def _lx_get_title(root: lxml_html.HtmlElement) -> str | None:
+    meta = _lx_get_meta(root, _TITLE_META)
+    if meta:
+        return meta
+    for tag_name in ("title", "h1"):
+        tag = next(root.iter(tag_name), None)
+        if tag is not None:
+            return "".join(s.strip() for s in tag.itertext())[:500]
+    return None
+
+
+def _lx_get_published_at(root: lxml_html.HtmlElement) -> str | None:
+    for attr, val in _PUBLISHED_META:
+        tag = _lx_find_meta(root, attr, val)
+        if tag is not None and tag.get("content"):
+            raw = tag.get("content")[:10]
+            if _DATE_RE.match(raw):
+                return raw
+
+    for time_tag in root.iter("time"):
+        raw = (time_tag.get("datetime") or "")[:10]
+        if _DATE_RE.match(raw):
+            return raw
+
+    return None
+
+
+def _lx_get_main_content(root: lxml_html.HtmlElement) -> tuple[str, int]:
+    """
+    Returns (raw_content_str, word_count).
+
+    Drops noise elements in place — callers must extract links and
+    metadata before calling this.
+    """
+    # Noise tags via lxml's C-level tag filter, then only the elements that
+    # carry a class or id are handed to the regex.
+    to_remove = list(root.iter(*_NOISE_TAGS))
+    to_remove += [
+        tag
+        for tag in _LX_CLASS_OR_ID(root)
+        if _NOISE_PATTERN.search(f"{tag.get('class') or ''} {tag.get('id') or ''}")
+    ]
+    for tag in to_remove:
+        # Skip the document root and tags already dropped via the first list
+        if tag.getparent() is not None:
+            tag.drop_tree()
+
+    main = _lx_find_main(root)
+    if main is None:
+        return "", 0
+
+    text = " ".join(" ".join(main.itertext()).split())
+    word_count = len(text.split())
+    return text[:_MAX_CONTENT_CHARS], word_count
+
+
+def _lx_find_main(root: lxml_html.HtmlElement) -> lxml_html.HtmlElement | None:
+    """Most likely main content container, same lookup order as the bs4 path."""
+    for tag_name in ("main", "article"):
+        tag = next(root.iter(tag_name), None)
+        if tag is not None:
+            return tag
+    for tag in root.iter(etree.Element):
+        if _MAIN_ID_PATTERN.search(tag.get("id") or ""):
+            return tag
+    for tag in root.iter(etree.Element):
+        if _MAIN_CLASS_PATTERN.search(tag.get("class") or ""):
+            return tag
+    return next(root.iter("body"), None)
+
+
+def _lx_extract_links(root: lxml_html.HtmlElement, base_url: str) -> list[str]:
+    links: list[str] = []
+    for tag in root.iter("a"):
+        href = tag.get("href")
+        if href is None:
+            continue
+        href = href.strip()
+        if not href or href.startswith(("#", "mailto:", "tel:", "javascript:")):
+            continue
+        full = urljoin(base_url, href)
+        parsed = urlparse(full)
+        if parsed.scheme in ("http", "https"):
+            links.append(full)
+    return links
+
+
+# ─── HTTP client ──────────────────────────────────────────────────────────────
+
+
+def _make_client(timeout: float, concurrency: int) -> httpx.AsyncClient:
+    """
+    HTTP/2 client with a keep-alive pool sized to the request concurrency.
+
+    Same-origin requests multiplex over one connection instead of paying a
+    TLS handshake each. Retries are handled by the callers, not the transport.
+    """
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(
+            max_keepalive_connections=concurrency,
+            max_connections=concurrency * 2,
+        ),
+        retries=0,
+    )
+    return httpx.AsyncClient(
+        headers=_HEADERS,
+        timeout=timeout,
+        follow_redirects=True,
+        max_redirects=5,
+        transport=transport,
+    )
+
+
+async def _read_html(resp: httpx.Response) -> str:
+    """Read at most _MAX_HTML_BYTES of a streamed response and decode it."""
+    chunks: list[bytes] = []
+    total = 0
+    async for chunk in resp.aiter_bytes(_READ_CHUNK_BYTES):
+        chunks.append(chunk)
+        total += len(chunk)
+        if total >= _MAX_HTML_BYTES:
+            break
+    body = b"".join(chunks)[:_MAX_HTML_BYTES]
+    try:
+        return body.decode(resp.encoding or "utf-8", errors="replace")
+    except LookupError:  # unknown charset in Content-Type
+        return body.decode("utf-8", errors="replace")
+
+
 # ─── Single-URL extraction ────────────────────────────────────────────────────
 
 
+# Recently extracted URLs and extractions in flight, shared across requests
+# so dashboard refreshes and overlapping batches fetch each page once.
+_EXTRACT_CACHE_SIZE = 2048
+_EXTRACT_CACHE_TTL = 300.0  # seconds
+
+# key → (expiry on the monotonic clock, result)
+_extract_cache: OrderedDict[str, tuple[float, ExtractResult]] = OrderedDict()
+_extract_inflight: dict[str, asyncio.Future[ExtractResult]] = {}
+
+
+def _extract_key(url: str) -> str:
+    """Scheme/host lowercased, fragment dropped, query params sorted."""
+    p = urlparse(url.strip())
+    query = urlencode(sorted(parse_qsl(p.query, keep_blank_values=True)))
+    return urlunparse(
+        (p.scheme.lower(), p.netloc.lower(), p.path or "/", p.params, query, "")
+    )
+
+
+def _cached_extract(key: str) -> ExtractResult | None:
+    entry = _extract_cache.get(key)
+    if entry is None:
+        return None
+    expires, result = entry
+    if expires <= time.monotonic():
+        del _extract_cache[key]
+        return None
+    _extract_cache.move_to_end(key)
+    return result
+
+
+def _store_extract(key: str, result: ExtractResult) -> None:
+    if result.error is not None:
+        return  # failures are retried next time
+    _extract_cache[key] = (time.monotonic() + _EXTRACT_CACHE_TTL, result)
+    _extract_cache.move_to_end(key)
+    while len(_extract_cache) > _EXTRACT_CACHE_SIZE:
+        _extract_cache.popitem(last=False)
+
+
 async def extract_urls(
     urls: list[str],
     concurrency: int = 5,
@@ -380,18 +696,29 @@ async def extract_urls(
 
     Each URL is processed independently; a failure on one URL does not
     affect the others. Returns one ExtractResult per input URL, preserving order.
+    The semaphore bounds only the network part — a URL releases its slot
+    before its HTML is parsed, so the next fetch starts meanwhile.
+
+    Successful extractions are reused for five minutes, and a URL already
+    being extracted (by this or another request) is awaited, not refetched.
     """
     sem = asyncio.Semaphore(concurrency)
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "it,en;q=0.9",
-    }
 
     async def _fetch_one(client: httpx.AsyncClient, url: str) -> ExtractResult:
         async with sem:
             try:
-                resp = await client.get(url)
+                async with client.stream("GET", url) as resp:
+                    if resp.status_code >= 400:
+                        return ExtractResult(url=url, error=f"HTTP {resp.status_code}")
+
+                    content_type = resp.headers.get("content-type", "")
+                    if "text/html" not in content_type:
+                        return ExtractResult(
+                            url=url, error=f"non-HTML content-type: {content_type[:60]}"
+                        )
+
+                    final_url = str(resp.url)
+                    html = await _read_html(resp)
             except httpx.TimeoutException:
                 return ExtractResult(url=url, error="timeout")
             except httpx.TooManyRedirects:
@@ -399,50 +726,71 @@ async def extract_urls(
             except httpx.RequestError as exc:
                 return ExtractResult(url=url, error=str(exc))
 
-            if resp.status_code >= 400:
-                return ExtractResult(url=url, error=f"HTTP {resp.status_code}")
-
-            content_type = resp.headers.get("content-type", "")
-            if "text/html" not in content_type:
-                return ExtractResult(
-                    url=url, error=f"non-HTML content-type: {content_type[:60]}"
-                )
-
-            soup = BeautifulSoup(resp.text, "lxml")
-            page = _extract_page_data(soup, str(resp.url))
-
-            return ExtractResult(
-                url=url,
-                title=page.title,
-                raw_content=page.raw_content,
-                word_count=page.word_count,
-                excerpt=page.excerpt,
-                published_at=page.published_at,
-            )
+        page, _ = _parse_page(html, final_url)
+
+        return ExtractResult(
+            url=url,
+            title=page.title,
+            raw_content=page.raw_content,
+            word_count=page.word_count,
+            excerpt=page.excerpt,
+            published_at=page.published_at,
+        )
+
+    async def _extract_one(client: httpx.AsyncClient, url: str) -> ExtractResult:
+        key = _extract_key(url)
+        shared = _cached_extract(key)
+        if shared is None and (pending := _extract_inflight.get(key)) is not None:
+            shared = await asyncio.shield(pending)
+        if shared is not None:
+            return replace(shared, url=url)  # echo the caller's spelling
+
+        fut: asyncio.Future[ExtractResult] = (
+            asyncio.get_running_loop().create_future()
+        )
+        _extract_inflight[key] = fut
+        try:
+            result = await _fetch_one(client, url)
+        except BaseException:
+            result = ExtractResult(url=url, error="extraction aborted")
+            raise
+        finally:
+            del _extract_inflight[key]
+            _store_extract(key, result)
+            fut.set_result(result)
+        return result
 
-    async with httpx.AsyncClient(
-        headers=headers,
-        timeout=timeout,
-        follow_redirects=True,
-        max_redirects=5,
-    ) as client:
-        tasks = [_fetch_one(client, url) for url in urls]
-        return list(await asyncio.gather(*tasks))
+    # TaskGroup rather than gather: an unexpected error cancels the
+    # remaining fetches instead of leaving them running unobserved.
+    async with _make_client(timeout, concurrency) as client:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(_extract_one(client, url)) for url in urls]
+    return [t.result() for t in tasks]
 
 
 # ─── URL utilities ────────────────────────────────────────────────────────────
 
 
-def _normalize_url(url: str) -> str:
-    """Strip fragment and trailing slash for visited-set deduplication."""
+@lru_cache(maxsize=8192)
+def _classify_link(url: str, base_domain: str) -> tuple[str, bool]:
+    """
+    Return (normalized_url, same_domain) from a single urlparse.
+
+    Cached because the same nav/footer links show up on nearly every page.
+    """
     p = urlparse(url)
+    return _normalize_parsed(p), _same_host(p.netloc, base_domain)
+
+
+def _normalize_parsed(p: ParseResult) -> str:
+    """Strip fragment and trailing slash for visited-set deduplication."""
     path = p.path.rstrip("/") or "/"
     normalized = urlunparse((p.scheme, p.netloc, path, p.params, p.query, ""))
     return normalized.lower()
 
 
-def _same_domain(url: str, base_domain: str) -> bool:
-    """True if url shares the same registered domain (allows www. prefix)."""
-    host = urlparse(url).netloc.lower()
+def _same_host(netloc: str, base_domain: str) -> bool:
+    """True if netloc shares the same registered domain (allows www. prefix)."""
+    host = netloc.lower()
     bd = base_domain.lower()
     return host == bd or host == f"www.{bd}" or bd == f"www.{host}"
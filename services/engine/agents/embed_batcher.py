@@ -0,0 +1,158 @@
+"""
+Embedding micro-batcher
+
+Coalesces embedding requests that arrive within a short window into one
+ONNX forward pass. One pass over 32 texts costs far less than 32 passes
+over one, so concurrent /embed calls share the model instead of queueing
+separate runs on the executor.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_MAX_QUEUED_JOBS = 1_024  # waiting requests before `embed` blocks
+
+
+@dataclass
+class _Job:
+    texts: list[str]
+    future: asyncio.Future[np.ndarray]
+
+
+class EmbedBatcher:
+    """
+    Queue in front of a blocking `embed(texts) -> (n, dims) matrix` call.
+
+    The consumer takes the first waiting job, collects more for up to
+    `window_ms` (or until `max_batch` texts are queued), runs one embed call
+    in the default executor and hands each job its rows. Jobs are never
+    split, so a single large request still runs as one call.
+
+    Up to `max_in_flight` embed calls run at once, so the next group is
+    collected and tokenized while the current one is in the model. Both
+    stages are bounded: once they are full the consumer stops taking jobs,
+    the queue fills, and `embed` waits for room (backpressure).
+
+    The consumer task starts on first use; use the batcher as an async
+    context manager (or call `aclose`) to stop it.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[list[str]], np.ndarray],
+        window_ms: float,
+        max_batch: int,
+        max_in_flight: int = 2,
+    ) -> None:
+        self._embed = embed
+        self._window = window_ms / 1000
+        self._max_batch = max_batch
+        self._max_in_flight = max_in_flight
+        self._queue: asyncio.Queue[_Job] | None = None
+        self._consumer: asyncio.Task[None] | None = None
+        self._running: set[asyncio.Task[None]] = set()
+
+    async def embed(self, texts: list[str]) -> np.ndarray:
+        """Rows for `texts`, in order — a view into the shared batch matrix."""
+        future: asyncio.Future[np.ndarray] = (
+            asyncio.get_running_loop().create_future()
+        )
+        await self._ensure_consumer().put(_Job(texts, future))
+        return await future
+
+    async def aclose(self) -> None:
+        tasks = [t for t in (self._consumer, *self._running) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # A consumer cancelled before it first ran never drained its queue
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._queue.get_nowait().future.cancel()
+        self._consumer = None
+        self._queue = None
+
+    async def __aenter__(self) -> "EmbedBatcher":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    def _ensure_consumer(self) -> asyncio.Queue[_Job]:
+        # Restart if the previous consumer died or belongs to another loop
+        if (
+            self._queue is None
+            or self._consumer is None
+            or self._consumer.done()
+            or self._consumer.get_loop() is not asyncio.get_running_loop()
+        ):
+            self._queue = asyncio.Queue(maxsize=_MAX_QUEUED_JOBS)
+            self._consumer = asyncio.create_task(self._run(self._queue))
+        return self._queue
+
+    async def _run(self, queue: asyncio.Queue[_Job]) -> None:
+        slots = asyncio.Semaphore(self._max_in_flight)
+        group: list[_Job] = []
+        try:
+            while True:
+                await slots.acquire()
+                group = [await queue.get()]
+                await self._collect(queue, group)
+                task = asyncio.create_task(self._embed_group(group))
+                group = []
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+                task.add_done_callback(lambda _: slots.release())
+        except asyncio.CancelledError:
+            # Shutdown: release every waiter instead of leaving it hanging
+            while not queue.empty():
+                group.append(queue.get_nowait())
+            for job in group:
+                job.future.cancel()
+            raise
+
+    async def _collect(self, queue: asyncio.Queue[_Job], group: list[_Job]) -> None:
+        """Add jobs to `group` until the window closes or the batch is full."""
+        loop = asyncio.get_running_loop()
+        size = len(group[0].texts)
+        deadline = loop.time() + self._window
+        while size < self._max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                return
+            try:
+                job = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return
+            group.append(job)
+            size += len(job.texts)
+
+    async def _embed_group(self, group: list[_Job]) -> None:
+        texts = [text for job in group for text in job.texts]
+        loop = asyncio.get_running_loop()
+        try:
+            matrix = await loop.run_in_executor(None, self._embed, texts)
+        except asyncio.CancelledError:
+            for job in group:
+                job.future.cancel()
+            raise
+        except Exception as exc:
+            for job in group:
+                if not job.future.done():
+                    job.future.set_exception(exc)
+            return
+
+        if len(group) > 1:
+            logger.debug("Embedded %d texts for %d requests", len(texts), len(group))
+        offset = 0
+        for job in group:
+            n = len(job.texts)
+            if not job.future.done():  # caller may have gone away
+                job.future.set_result(matrix[offset : offset + n])
+            offset += n
@@ -4,21 +4,34 @@ Embedder Agent
 Generates dense vector embeddings for text using fastembed (ONNX runtime).
 Model: paraphrase-multilingual-MiniLM-L12-v2 — 384 dimensions, multilingual.
 
-The model is downloaded on first use (~90 MB) and cached in /app/models.
+fastembed serves this model from Qdrant's dynamically quantized INT8 ONNX
+export (qdrant/paraphrase-multilingual-MiniLM-L12-v2-onnx-Q): smaller
+weights and faster MatMuls on CPU than FP32, at a negligible
+similarity-quality cost. The Docker image bakes it into /app/models at
+build time; elsewhere it is downloaded on first use and cached there.
 Embedding is CPU-only; fastembed uses ONNX runtime (no PyTorch required).
 """
 
-import asyncio
 import logging
-from dataclasses import dataclass, field
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+import runtime
+from agents.embed_batcher import EmbedBatcher
+from config import settings
 
 logger = logging.getLogger(__name__)
 
 # ─── Constants ────────────────────────────────────────────────────────────────
 
 _MODEL_NAME = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+EMBEDDING_DIM = 384       # output dimension of _MODEL_NAME
 _CACHE_DIR = "/app/models"
 _MAX_TEXT_CHARS = 4_000   # truncate before embedding
+_BATCH_SIZE = 32          # texts per ONNX forward pass
 
 
 # ─── Data classes ─────────────────────────────────────────────────────────────
@@ -31,9 +44,10 @@ class EmbedRequest:
 
 
 @dataclass
-class EmbedResult:
-    id: str
-    embedding: list[float] = field(default_factory=list)
+class EmbedBatchResult:
+    ids: list[str]
+    # (n, dims) float32 matrix, row i belongs to ids[i]; no rows on error
+    embeddings: np.ndarray
     error: str | None = None
 
 
@@ -44,30 +58,41 @@ class EmbedderAgent:
     """
     Generates embeddings for a batch of texts using fastembed.
 
-    The underlying TextEmbedding model is a singleton — loaded once on first
-    call and reused for all subsequent requests. Model loading blocks the
-    event loop briefly the first time; subsequent calls are fast.
+    The underlying TextEmbedding model is a singleton — loaded once (at
+    startup via `warmup`, else on first call) and reused for all subsequent
+    requests.
 
     fastembed.embed() is synchronous; we run it in the default executor to
     avoid blocking the async event loop.
     """
 
     _model = None  # class-level singleton
+    # Warmup and early requests may reach _get_model from different executor
+    # threads; only one of them loads the model
+    _model_lock = threading.Lock()
 
     def _get_model(self):  # type: ignore[return]
-        if EmbedderAgent._model is None:
-            try:
-                # Import deferred so the module loads even if fastembed is absent
-                from fastembed import TextEmbedding  # type: ignore[import-untyped]
-
-                logger.info("Loading embedding model %s …", _MODEL_NAME)
-                EmbedderAgent._model = TextEmbedding(
-                    _MODEL_NAME, cache_dir=_CACHE_DIR
-                )
-                logger.info("Embedding model loaded.")
-            except Exception as exc:
-                logger.error("Failed to load embedding model: %s", exc)
-                raise
+        if EmbedderAgent._model is not None:
+            return EmbedderAgent._model
+        with EmbedderAgent._model_lock:
+            if EmbedderAgent._model is None:
+                try:
+                    # Import deferred so the module loads even if fastembed is absent
+                    from fastembed import TextEmbedding  # type: ignore[import-untyped]
+
+                    logger.info("Loading embedding model %s …", _MODEL_NAME)
+                    started = time.monotonic()
+                    EmbedderAgent._model = TextEmbedding(
+                        _MODEL_NAME,
+                        cache_dir=_CACHE_DIR,
+                        threads=runtime.intra_op_threads(),
+                    )
+                    logger.info(
+                        "Embedding model loaded in %.1fs.", time.monotonic() - started
+                    )
+                except Exception as exc:
+                    logger.error("Failed to load embedding model: %s", exc)
+                    raise
         return EmbedderAgent._model
 
     def is_configured(self) -> bool:
@@ -77,31 +102,75 @@ class EmbedderAgent:
         except ImportError:
             return False
 
-    def _embed_sync(self, texts: list[str]) -> list[list[float]]:
-        """Blocking call — must be run in an executor."""
+    def _embed_sync(self, texts: list[str]) -> np.ndarray:
+        """
+        Blocking call — must be run in an executor.
+
+        Returns an (n, dims) float32 matrix; rows stay as NumPy data rather
+        than being boxed into Python floats.
+
+        Each forward pass pads to its longest text, so when the input spans
+        several passes it is embedded shortest-first (character length as a
+        proxy for token count) and the rows are put back in input order.
+        """
         model = self._get_model()
-        return [emb.tolist() for emb in model.embed(texts)]
+        if len(texts) <= _BATCH_SIZE:
+            embeddings = model.embed(texts, batch_size=_BATCH_SIZE)
+            return np.stack(list(embeddings)).astype(np.float32, copy=False)
+
+        order = np.argsort([len(t) for t in texts], kind="stable")
+        embeddings = model.embed([texts[i] for i in order], batch_size=_BATCH_SIZE)
+        by_length = np.stack(list(embeddings)).astype(np.float32, copy=False)
+        matrix = np.empty_like(by_length)
+        matrix[order] = by_length
+        return matrix
+
+    def warmup(self) -> None:
+        """
+        Blocking call — load the model and run one forward pass so the ONNX
+        session is initialised before the first request. Failures are logged,
+        not raised: the engine still serves everything but embeddings.
+        """
+        if not self.is_configured():
+            return
+        try:
+            self._embed_sync(["warmup"])
+        except Exception as exc:
+            logger.warning("Embedding warmup failed: %s", exc)
 
-    async def embed_batch(self, items: list[EmbedRequest]) -> list[EmbedResult]:
+    async def embed_batch(self, items: list[EmbedRequest]) -> EmbedBatchResult:
         """
-        Embed a list of items concurrently via thread executor.
+        Embed a list of items via the process-wide micro-batcher, which
+        runs the model in a thread executor.
 
-        Returns one EmbedResult per input item, preserving order.
+        Returns the ids and one matrix of embeddings in input order; the
+        batch succeeds or fails as a whole.
         """
+        ids = [item.id for item in items]
         if not items:
-            return []
+            return EmbedBatchResult(ids=ids, embeddings=_no_rows())
 
         texts = [item.text[:_MAX_TEXT_CHARS] for item in items]
 
         try:
-            loop = asyncio.get_event_loop()
-            embeddings = await loop.run_in_executor(None, self._embed_sync, texts)
+            # Shared with concurrent requests — one ONNX pass for all of them
+            embeddings = await embed_batcher.embed(texts)
         except Exception as exc:
             error_msg = str(exc)
             logger.error("Embedding batch failed: %s", error_msg)
-            return [EmbedResult(id=item.id, error=error_msg) for item in items]
+            return EmbedBatchResult(ids=ids, embeddings=_no_rows(), error=error_msg)
+
+        return EmbedBatchResult(ids=ids, embeddings=embeddings)
+
+
+def _no_rows() -> np.ndarray:
+    return np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+
 
-        return [
-            EmbedResult(id=item.id, embedding=emb)
-            for item, emb in zip(items, embeddings)
-        ]
+# Process-wide: requests arriving within the window share one forward pass
+embed_batcher = EmbedBatcher(
+    lambda texts: EmbedderAgent()._embed_sync(texts),
+    window_ms=settings.embed_batch_window_ms,
+    max_batch=settings.embed_max_batch,
+    max_in_flight=settings.embed_max_in_flight,
+)
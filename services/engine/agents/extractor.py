@@ -3,14 +3,20 @@ Entity Extractor Agent
 
 Uses Claude Haiku to extract named entities from a single content item.
 Returns structured entity data (label, type, salience, context) for
-storage by the caller.
+storage by the caller. Multi-item requests can optionally go through the
+Message Batches API (half the token cost, higher latency).
 """
 
 import asyncio
+import hashlib
 import logging
+import random
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 
 import anthropic
+import orjson
 
 from config import settings
 
@@ -18,9 +24,15 @@ logger = logging.getLogger(__name__)
 
 # ─── Constants ────────────────────────────────────────────────────────────────
 
-_MODEL = "claude-haiku-4-5-20251001"
+_MODEL = "claude-haiku-4-5-20251001"  # batch path; direct calls use the fast model
 _MAX_TEXT_CHARS = 3_000   # truncate before sending to LLM
 _MAX_RETRIES = 3
+_BACKOFF_CAP_SECONDS = 30.0
+_MAX_TOKENS = 1024
+_BATCH_POLL_SECONDS = 5.0
+_BATCH_MAX_WAIT_SECONDS = 900.0  # give up (and cancel) after 15 minutes
+_CACHE_SIZE = 4_096       # distinct (title, text) pairs remembered per process
+_PREFILL = "{"
 
 _ENTITY_TYPE_VALUES = [
     "BRAND",
@@ -33,61 +45,33 @@ _ENTITY_TYPE_VALUES = [
     "OTHER",
 ]
 
-_TOOL_DEF: dict = {
-    "name": "extract_entities",
-    "description": (
-        "Extract all named entities that are relevant to understanding "
-        "the main subjects of the provided content."
-    ),
-    "input_schema": {
-        "type": "object",
-        "properties": {
-            "entities": {
-                "type": "array",
-                "description": "Named entities extracted from the content.",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "label": {
-                            "type": "string",
-                            "description": "The entity name as it appears in the text.",
-                        },
-                        "type": {
-                            "type": "string",
-                            "enum": _ENTITY_TYPE_VALUES,
-                            "description": (
-                                "BRAND: company or brand name; "
-                                "PERSON: individual person; "
-                                "ORGANIZATION: institution or org; "
-                                "TOPIC: subject or theme; "
-                                "PRODUCT: specific product or service; "
-                                "LOCATION: place or region; "
-                                "CONCEPT: abstract idea or methodology; "
-                                "OTHER: anything else."
-                            ),
-                        },
-                        "salience": {
-                            "type": "number",
-                            "description": (
-                                "How central this entity is to the content "
-                                "(0.0 = peripheral, 1.0 = main subject)."
-                            ),
-                        },
-                        "context": {
-                            "type": "string",
-                            "description": (
-                                "A short text snippet (max 120 chars) showing "
-                                "the entity in context. Optional."
-                            ),
-                        },
-                    },
-                    "required": ["label", "type", "salience"],
-                },
-            }
-        },
-        "required": ["entities"],
-    },
-}
+# Static preamble shared by every call: the task plus the JSON output
+# contract (no tool schema to re-send). The cache breakpoint on this block
+# bills it at the cache-read rate after the first call.
+_SYSTEM_PROMPT = """\
+You extract named entities from web content for a brand-visibility analysis.
+Identify the entities that matter for understanding the main subjects of the
+content, classify each one and score its salience.
+
+Respond with one JSON object and nothing else:
+{"entities": [{"label": "...", "type": "...", "salience": 0.0, "context": "..."}]}
+
+- label: the entity name as it appears in the text.
+- type: one of BRAND (company or brand name), PERSON (individual person),
+  ORGANIZATION (institution or org), TOPIC (subject or theme), PRODUCT
+  (specific product or service), LOCATION (place or region), CONCEPT
+  (abstract idea or methodology), OTHER (anything else).
+- salience: how central the entity is to the content (0.0 = peripheral,
+  1.0 = main subject).
+- context: optional short snippet (max 120 chars) showing the entity in
+  context."""
+_SYSTEM: list[dict] = [
+    {
+        "type": "text",
+        "text": _SYSTEM_PROMPT,
+        "cache_control": {"type": "ephemeral"},
+    }
+]
 
 
 # ─── Data classes ─────────────────────────────────────────────────────────────
@@ -108,6 +92,49 @@ class ItemExtractionResult:
     error: str | None = None
 
 
+# ─── Shared client ────────────────────────────────────────────────────────────
+
+# One connection pool for every EntityExtractorAgent in the process.
+_client: anthropic.AsyncAnthropic | None = None
+
+
+def _get_client() -> anthropic.AsyncAnthropic:
+    global _client
+    if _client is None:
+        _client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
+    return _client
+
+
+# ─── Result cache ─────────────────────────────────────────────────────────────
+
+# Content hash → entities of the last successful extraction. Re-runs and
+# ingest retries of the same article skip the LLM call entirely.
+_entity_cache: OrderedDict[str, list[ExtractedEntity]] = OrderedDict()
+
+
+def _content_key(title: str, text: str) -> str:
+    """Hash of exactly what the prompt sees (title + truncated text)."""
+    payload = f"{title}\0{text[:_MAX_TEXT_CHARS]}".encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _cached_result(content_id: str, key: str) -> ItemExtractionResult | None:
+    entities = _entity_cache.get(key)
+    if entities is None:
+        return None
+    _entity_cache.move_to_end(key)
+    return ItemExtractionResult(content_id=content_id, entities=list(entities))
+
+
+def _store_result(key: str, result: ItemExtractionResult) -> None:
+    if result.error is not None:
+        return  # failures are retried next time
+    _entity_cache[key] = list(result.entities)
+    _entity_cache.move_to_end(key)
+    while len(_entity_cache) > _CACHE_SIZE:
+        _entity_cache.popitem(last=False)
+
+
 # ─── Agent ────────────────────────────────────────────────────────────────────
 
 
@@ -115,20 +142,11 @@ class EntityExtractorAgent:
     """
     Extracts named entities from a single content item using Claude Haiku.
 
-    One API call per item; processes items sequentially to respect
-    rate limits. Retries on 429/529 with exponential backoff.
+    One API call per item; `extract_all` keeps up to `concurrency` calls
+    in flight. Retries on 429/529 with exponential backoff.
+    `extract_many` can instead submit all items as one Message Batch.
     """
 
-    def __init__(self) -> None:
-        self._client: anthropic.AsyncAnthropic | None = None
-
-    def _get_client(self) -> anthropic.AsyncAnthropic:
-        if self._client is None:
-            self._client = anthropic.AsyncAnthropic(
-                api_key=settings.anthropic_api_key
-            )
-        return self._client
-
     def is_configured(self) -> bool:
         return bool(settings.anthropic_api_key)
 
@@ -142,31 +160,26 @@ class EntityExtractorAgent:
         Extract entities from one content item.
 
         Returns ItemExtractionResult with entities list on success,
-        or error string on failure.
+        or error string on failure. Content already extracted in this
+        process is served from the content-hash cache.
         """
-        truncated = text[:_MAX_TEXT_CHARS]
-        prompt = (
-            f"Title: {title}\n\n"
-            f"Content:\n{truncated}\n\n"
-            "Extract all relevant named entities from the content above."
-        )
+        key = _content_key(title, text)
+        cached = _cached_result(content_id, key)
+        if cached is not None:
+            return cached
 
-        client = self._get_client()
+        client = _get_client()
         last_error: str = "Unknown error"
 
         for attempt in range(_MAX_RETRIES):
             try:
                 response = await client.messages.create(
-                    model=_MODEL,
-                    max_tokens=1024,
-                    tools=[_TOOL_DEF],  # type: ignore[arg-type]
-                    tool_choice={"type": "tool", "name": "extract_entities"},
-                    messages=[{"role": "user", "content": prompt}],
+                    **_build_params(title, text, settings.anthropic_fast_model)
                 )
-            except anthropic.RateLimitError:
-                wait = 2**attempt  # 1s, 2s, 4s
+            except anthropic.RateLimitError as exc:
+                wait = _backoff(attempt, exc)
                 logger.warning(
-                    "Rate limit for content %s, retry in %ds (%d/%d)",
+                    "Rate limit for content %s, retry in %.1fs (%d/%d)",
                     content_id,
                     wait,
                     attempt + 1,
@@ -190,32 +203,211 @@ class EntityExtractorAgent:
                 )
                 return ItemExtractionResult(content_id=content_id, error=last_error)
 
-            # ── Parse tool_use result ─────────────────────────────────────────
-            entities: list[ExtractedEntity] = []
-            for block in response.content:
-                if block.type == "tool_use" and block.name == "extract_entities":
-                    raw_list = block.input.get("entities", [])
-                    for e in raw_list:
-                        label = str(e.get("label", "")).strip()
-                        if not label:
-                            continue
-                        entity_type = str(e.get("type", "OTHER")).upper()
-                        if entity_type not in _ENTITY_TYPE_VALUES:
-                            entity_type = "OTHER"
-                        salience = float(e.get("salience", 0.5))
-                        salience = max(0.0, min(1.0, salience))
-                        ctx = e.get("context")
-                        context_str = str(ctx)[:120] if ctx else None
-                        entities.append(
-                            ExtractedEntity(
-                                label=label,
-                                type=entity_type,
-                                salience=salience,
-                                context=context_str,
-                            )
-                        )
-                    break
+            try:
+                entities = _parse_entities(response.content)
+            except (ValueError, TypeError) as exc:
+                last_error = f"Unparseable model output: {exc}"
+                logger.error("Bad output for content %s: %s", content_id, exc)
+                return ItemExtractionResult(content_id=content_id, error=last_error)
 
-            return ItemExtractionResult(content_id=content_id, entities=entities)
+            result = ItemExtractionResult(content_id=content_id, entities=entities)
+            _store_result(key, result)
+            return result
 
         return ItemExtractionResult(content_id=content_id, error=last_error)
+
+    async def extract_many(
+        self,
+        items: list[tuple[str, str, str]],
+    ) -> list[ItemExtractionResult]:
+        """
+        Extract entities from several (content_id, title, text) items.
+
+        With `extract_use_batches` enabled and more than one item, all
+        requests are submitted as a single Message Batch and polled until
+        it ends; otherwise items go through `extract_all`.
+        Results are returned in input order.
+        """
+        if not settings.extract_use_batches or len(items) < 2:
+            return await self.extract_all(items)
+
+        # Only content missing from the cache goes into the batch
+        results: list[ItemExtractionResult | None] = [
+            _cached_result(cid, _content_key(title, text))
+            for cid, title, text in items
+        ]
+        pending = [i for i, r in enumerate(results) if r is None]
+        if len(pending) > 1:
+            fresh = await self._extract_batch([items[i] for i in pending])
+        else:
+            fresh = await self.extract_all([items[i] for i in pending])
+        for i, result in zip(pending, fresh):
+            results[i] = result
+        return results  # type: ignore[return-value]
+
+    async def extract_all(
+        self,
+        items: list[tuple[str, str, str]],
+        concurrency: int | None = None,
+    ) -> list[ItemExtractionResult]:
+        """
+        Run `extract` over (content_id, title, text) items with at most
+        `concurrency` calls in flight (default: `extract_concurrency`).
+        Results are returned in input order; an unexpected exception on one
+        item becomes that item's error instead of failing the others.
+        """
+        sem = asyncio.Semaphore(concurrency or settings.extract_concurrency)
+
+        async def _one(cid: str, title: str, text: str) -> ItemExtractionResult:
+            async with sem:
+                return await self.extract(content_id=cid, title=title, text=text)
+
+        outcomes = await asyncio.gather(
+            *(_one(cid, title, text) for cid, title, text in items),
+            return_exceptions=True,
+        )
+        results: list[ItemExtractionResult] = []
+        for (cid, _, _), outcome in zip(items, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error("Extraction for %s failed: %s", cid, outcome)
+                outcome = ItemExtractionResult(content_id=cid, error=str(outcome))
+            elif isinstance(outcome, BaseException):
+                raise outcome  # cancellation — don't swallow it
+            results.append(outcome)
+        return results
+
+    async def _extract_batch(
+        self,
+        items: list[tuple[str, str, str]],
+    ) -> list[ItemExtractionResult]:
+        # custom_id must match ^[a-zA-Z0-9_-]{1,64}$, which arbitrary content
+        # ids don't guarantee — key requests by position instead.
+        client = _get_client()
+        try:
+            batch = await client.messages.batches.create(
+                requests=[
+                    {
+                        "custom_id": f"item-{i}",
+                        "params": _build_params(title, text, _MODEL),
+                    }
+                    for i, (_, title, text) in enumerate(items)
+                ]
+            )
+            deadline = time.monotonic() + _BATCH_MAX_WAIT_SECONDS
+            while batch.processing_status != "ended":
+                if time.monotonic() >= deadline:
+                    await client.messages.batches.cancel(batch.id)
+                    return _batch_failure(items, "Batch timed out")
+                await asyncio.sleep(_BATCH_POLL_SECONDS)
+                batch = await client.messages.batches.retrieve(batch.id)
+
+            results: dict[str, ItemExtractionResult] = {}
+            async for entry in await client.messages.batches.results(batch.id):
+                i = int(entry.custom_id.removeprefix("item-"))
+                content_id = items[i][0]
+                if entry.result.type == "succeeded":
+                    try:
+                        entities = _parse_entities(entry.result.message.content)
+                    except (ValueError, TypeError) as exc:
+                        results[entry.custom_id] = ItemExtractionResult(
+                            content_id=content_id,
+                            error=f"Unparseable model output: {exc}",
+                        )
+                        continue
+                    ok = ItemExtractionResult(content_id=content_id, entities=entities)
+                    _store_result(_content_key(items[i][1], items[i][2]), ok)
+                    results[entry.custom_id] = ok
+                else:
+                    results[entry.custom_id] = ItemExtractionResult(
+                        content_id=content_id,
+                        error=f"Batch request {entry.result.type}",
+                    )
+        except anthropic.APIStatusError as exc:
+            error = f"API error {exc.status_code}: {exc.message}"
+            logger.error("Batch extraction failed: %s", error)
+            return _batch_failure(items, error)
+        except Exception as exc:
+            logger.error("Batch extraction failed: %s", exc)
+            return _batch_failure(items, str(exc))
+
+        return [
+            results.get(f"item-{i}")
+            or ItemExtractionResult(content_id=cid, error="Missing batch result")
+            for i, (cid, _, _) in enumerate(items)
+        ]
+
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _build_params(title: str, text: str, model: str) -> dict:
+    """Message parameters for one item — shared by direct and batch calls."""
+    truncated = text[:_MAX_TEXT_CHARS]
+    prompt = (
+        f"Title: {title}\n\n"
+        f"Content:\n{truncated}\n\n"
+        "Extract all relevant named entities from the content above."
+    )
+    return {
+        "model": model,
+        "max_tokens": _MAX_TOKENS,
+        "system": _SYSTEM,
+        "messages": [
+            {"role": "user", "content": prompt},
+            # Prefill so the reply starts inside the JSON object
+            {"role": "assistant", "content": _PREFILL},
+        ],
+    }
+
+
+def _parse_entities(content: list) -> list[ExtractedEntity]:
+    """
+    Parse the JSON object of a response (continuing the "{" prefill).
+    Raises ValueError when the model did not return the expected shape.
+    """
+    raw = _PREFILL + "".join(b.text for b in content if b.type == "text")
+    data = orjson.loads(raw[: raw.rfind("}") + 1])
+    if not isinstance(data, dict) or not isinstance(data.get("entities", []), list):
+        raise ValueError("expected {\"entities\": [...]}")
+
+    entities: list[ExtractedEntity] = []
+    for e in data.get("entities", []):
+        if not isinstance(e, dict):
+            continue
+        label = str(e.get("label", "")).strip()
+        if not label:
+            continue
+        entity_type = str(e.get("type", "OTHER")).upper()
+        if entity_type not in _ENTITY_TYPE_VALUES:
+            entity_type = "OTHER"
+        salience = float(e.get("salience", 0.5))
+        salience = max(0.0, min(1.0, salience))
+        ctx = e.get("context")
+        context_str = str(ctx)[:120] if ctx else None
+        entities.append(
+            ExtractedEntity(
+                label=label,
+                type=entity_type,
+                salience=salience,
+                context=context_str,
+            )
+        )
+    return entities
+
+
+def _backoff(attempt: int, exc: anthropic.RateLimitError) -> float:
+    """
+    Retry-After when the server sends one, otherwise full jitter: a uniform
+    draw in [0, min(cap, 2**attempt)] so concurrent workers hitting the same
+    429 don't retry in lockstep.
+    """
+    try:
+        return float(exc.response.headers["retry-after"])
+    except (KeyError, ValueError):
+        return random.uniform(0, min(_BACKOFF_CAP_SECONDS, 2**attempt))
+
+
+def _batch_failure(
+    items: list[tuple[str, str, str]], error: str
+) -> list[ItemExtractionResult]:
+    return [ItemExtractionResult(content_id=cid, error=error) for cid, _, _ in items]
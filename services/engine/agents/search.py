@@ -7,18 +7,38 @@ being returned to the caller.
 """
 
 import asyncio
+import time
 from dataclasses import dataclass, field
 
 import httpx
+import orjson
 
 from config import settings
 
 # ─── Brave Search endpoint ────────────────────────────────────────────────────
 
 _BRAVE_URL = "https://api.search.brave.com/res/v1/web/search"
+_MIN_INTERVAL = 1.0  # seconds between call starts (free-tier 1 req/s)
+_TIMEOUT = 15.0
+_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
 
 # ─── Per-platform query builders ──────────────────────────────────────────────
 
+# Static format strings; only the matched platform's gets interpolated
+_TEMPLATES: dict[str, str] = {
+    "SUBSTACK": 'site:substack.com "{b}"',
+    "MEDIUM": 'site:medium.com "{b}"',
+    "LINKEDIN": 'site:linkedin.com/pulse "{b}"',
+    "REDDIT": 'site:reddit.com "{b}"',
+    "YOUTUBE": 'site:youtube.com "{b}"',
+    "TWITTER": 'site:twitter.com "{b}"',
+    "QUORA": 'site:quora.com "{b}"',
+    "OTHER": '"{b}"',
+}
+
+# Every platform build_query understands — the API validates against this
+PLATFORMS: frozenset[str] = frozenset(_TEMPLATES) | {"WEBSITE", "NEWS"}
+
 
 def build_query(platform: str, brand: str, domain: str | None) -> str | None:
     """
@@ -37,17 +57,8 @@ def build_query(platform: str, brand: str, domain: str | None) -> str | None:
         exclusion = f" -site:{domain}" if domain else ""
         return f'"{b}" (news OR article OR interview OR press){exclusion}'
 
-    _TEMPLATES: dict[str, str] = {
-        "SUBSTACK": f'site:substack.com "{b}"',
-        "MEDIUM": f'site:medium.com "{b}"',
-        "LINKEDIN": f'site:linkedin.com/pulse "{b}"',
-        "REDDIT": f'site:reddit.com "{b}"',
-        "YOUTUBE": f'site:youtube.com "{b}"',
-        "TWITTER": f'site:twitter.com "{b}"',
-        "QUORA": f'site:quora.com "{b}"',
-        "OTHER": f'"{b}"',
-    }
-    return _TEMPLATES.get(platform)
+    template = _TEMPLATES.get(platform)
+    return template.format(b=b) if template else None
 
 
 # ─── Data classes ─────────────────────────────────────────────────────────────
@@ -76,10 +87,49 @@ class SearchAgent:
     Queries the Brave Search API for each requested platform.
 
     Requires BRAVE_SEARCH_API_KEY to be set in config.
-    Applies a 1-second pause between API calls to stay within rate limits.
+    Platforms are queried concurrently; call starts are paced at most one
+    per second (the key's rate limit, shared across platforms) and the next
+    slot is pushed out by the server's Retry-After on 429.
     Brave supports up to 20 results per request (vs Google CSE's 10).
+
+    The HTTP/2 client is created on first use and kept for the agent's
+    lifetime; use the agent as an async context manager (or call `aclose`)
+    to release its connections.
     """
 
+    def __init__(self) -> None:
+        self._next_ok: float = 0.0  # monotonic time the next call may start
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=_TIMEOUT, http2=True, limits=_LIMITS
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "SearchAgent":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def _wait_turn(self) -> None:
+        """
+        Reserve the next call slot and sleep until it opens. The reservation
+        happens before any await, so concurrent callers get distinct slots.
+        """
+        now = time.monotonic()
+        start = max(now, self._next_ok)
+        self._next_ok = start + _MIN_INTERVAL
+        if start > now:
+            await asyncio.sleep(start - now)
+
     def is_configured(self) -> bool:
         return bool(settings.brave_search_api_key)
 
@@ -96,42 +146,45 @@ class SearchAgent:
         # Brave supports up to 20 results per request
         count = max(1, min(max_results_per_platform, 20))
 
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            for i, platform in enumerate(platforms):
-                query = build_query(platform, brand, domain)
-                if query is None:
-                    result.errors.append(
-                        {
-                            "platform": platform,
-                            "error": "skipped — requires domain (not provided)",
-                        }
-                    )
-                    continue
-
-                # Polite delay between API calls (skip before first request)
-                if i > 0:
-                    await asyncio.sleep(1.0)
-
-                items, error = await self._call_brave(client, query, count)
-
-                if error:
-                    result.errors.append({"platform": platform, "error": error})
+        queries: list[tuple[str, str]] = []
+        for platform in platforms:
+            query = build_query(platform, brand, domain)
+            if query is None:
+                result.errors.append(
+                    {
+                        "platform": platform,
+                        "error": "skipped — requires domain (not provided)",
+                    }
+                )
+                continue
+            queries.append((platform, query))
+
+        # All platforms in flight at once; _wait_turn spaces the call starts
+        client = self._get_client()
+        responses = await asyncio.gather(
+            *(self._call_brave(client, query, count) for _, query in queries)
+        )
+
+        # Merge in request order so URL dedup stays deterministic
+        for (platform, _), (items, error) in zip(queries, responses):
+            if error:
+                result.errors.append({"platform": platform, "error": error})
+                continue
+
+            for item in items:
+                url = item.get("url", "").strip()
+                if not url or url in seen_urls:
                     continue
-
-                for item in items:
-                    url = item.get("url", "").strip()
-                    if not url or url in seen_urls:
-                        continue
-                    seen_urls.add(url)
-                    result.results.append(
-                        SearchResult(
-                            url=url,
-                            title=item.get("title", url).strip(),
-                            snippet=item.get("description", "").strip() or None,
-                            platform=platform,
-                        )
+                seen_urls.add(url)
+                result.results.append(
+                    SearchResult(
+                        url=url,
+                        title=item.get("title", url).strip(),
+                        snippet=item.get("description", "").strip() or None,
+                        platform=platform,
                     )
-                result.total_found = len(result.results)
+                )
+        result.total_found = len(result.results)
 
         return result
 
@@ -143,13 +196,15 @@ class SearchAgent:
         max_retries: int = 3,
     ) -> tuple[list[dict], str | None]:
         """
-        Call the Brave Search API with exponential backoff on 429.
+        Call the Brave Search API, retrying on 429 after Retry-After
+        (exponential backoff when the header is missing).
         Returns (items, error_message).
         items is the raw list from response["web"]["results"].
         """
         last_error: str = "unknown error"
 
         for attempt in range(max_retries):
+            await self._wait_turn()
             try:
                 resp = await client.get(
                     _BRAVE_URL,
@@ -166,8 +221,8 @@ class SearchAgent:
             if resp.status_code == 429:
                 last_error = "Brave Search rate limit exceeded"
                 if attempt < max_retries - 1:
-                    wait = 2**attempt  # 1s → 2s → 4s
-                    await asyncio.sleep(wait)
+                    wait = _retry_after(resp, default=2**attempt)
+                    self._next_ok = max(self._next_ok, time.monotonic() + wait)
                     continue
                 return [], f"{last_error} after {max_retries} attempts"
 
@@ -178,10 +233,24 @@ class SearchAgent:
             if resp.status_code != 200:
                 return [], f"HTTP {resp.status_code}"
 
-            data: dict = resp.json()
+            try:
+                data: dict = orjson.loads(resp.content)
+            except orjson.JSONDecodeError:
+                return [], "Invalid JSON response"
 
             # "web" key is absent when there are no results (not an error)
             web = data.get("web", {})
             return web.get("results", []), None
 
         return [], last_error
+
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _retry_after(resp: httpx.Response, default: float) -> float:
+    """Seconds from the Retry-After header, or `default` if absent/invalid."""
+    try:
+        return float(resp.headers["retry-after"])
+    except (KeyError, ValueError):
+        return default
@@ -2,34 +2,161 @@
 Analyze API
 
 POST /api/analyze/topics       — cluster content items by embedding similarity
+POST /api/analyze/topics/arrow — same, items sent as an Arrow IPC stream
 POST /api/analyze/suggestions  — generate actionable suggestions via Claude Haiku
+POST /api/analyze/suggestions/stream — same, streamed one suggestion per SSE event
 """
 
+import asyncio
 import logging
-
-from fastapi import APIRouter, Depends
-from pydantic import BaseModel
+import random
+from collections.abc import AsyncIterator
+from functools import lru_cache
+from itertools import islice
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import (
+    AfterValidator,
+    Base64Bytes,
+    BaseModel,
+    BeforeValidator,
+    ConfigDict,
+    Field,
+    WithJsonSchema,
+    model_validator,
+)
 
 import anthropic
+import httpx
+import numpy as np
+import orjson
 
-from agents.clusterer import ClusterItem, TopicClusterer
+from agents.clusterer import ClusterResult, TopicClusterer
+from agents.embedder import EMBEDDING_DIM
 from api.deps import verify_api_key
+from api.llm_cache import ResponseCache, cache_key, normalize
+from api.llm_fleet import FleetDispatcher
 from config import settings
 
+try:
+    # Optional — binary transport for /topics/arrow; the JSON endpoint
+    # works without it.
+    import pyarrow as pa  # type: ignore[import-untyped]
+except ImportError:
+    pa = None
+
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/analyze", tags=["analyze"])
+router = APIRouter(
+    prefix="/api/analyze",
+    tags=["analyze"],
+    default_response_class=ORJSONResponse,
+)
 
 _clusterer = TopicClusterer()
 
+# ─── Shared client ────────────────────────────────────────────────────────────
+
+# One connection pool for every analyze request in the process, so TLS
+# sessions to the API are reused instead of renegotiated per call.
+_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+_TIMEOUT = 30.0
+
+_client: anthropic.AsyncAnthropic | None = None
+
+
+def _get_client() -> anthropic.AsyncAnthropic:
+    global _client
+    if _client is None:
+        _client = anthropic.AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            http_client=httpx.AsyncClient(limits=_LIMITS, timeout=_TIMEOUT),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Release the shared pool (called from the app lifespan)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+# Bulk (fan-out) calls are pooled into Message Batches when enabled;
+# interactive ones always go direct.
+fleet = FleetDispatcher(_get_client)
+
+_INTERACTIVE_BUDGET_MS = 2_000
+_BULK_BUDGET_MS = 600_000
+
 
 # ─── Request / Response models ────────────────────────────────────────────────
 
 
+def _as_vector(value: object) -> np.ndarray:
+    """One C-level conversion instead of validating each float in Python."""
+    try:
+        vector = np.asarray(value, dtype=np.float32)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"embedding must be a list of numbers ({exc})") from None
+    if vector.shape != (EMBEDDING_DIM,):
+        raise ValueError(f"embedding must have exactly {EMBEDDING_DIM} values")
+    # np.asarray turns None into NaN — reject that (and inf) like list[float] did
+    if not np.isfinite(vector).all():
+        raise ValueError("embedding values must be finite numbers")
+    return vector
+
+
+# float32 vector at ingress; documented as the JSON array clients send
+Vector = Annotated[
+    np.ndarray,
+    BeforeValidator(_as_vector),
+    WithJsonSchema(
+        {
+            "type": "array",
+            "items": {"type": "number"},
+            "minItems": EMBEDDING_DIM,
+            "maxItems": EMBEDDING_DIM,
+        }
+    ),
+]
+
+
+def _from_fp16(raw: bytes) -> np.ndarray:
+    """Decode little-endian fp16 once, at ingress, with the same checks."""
+    vector = np.frombuffer(raw, dtype="<f2").astype(np.float32)
+    if not np.isfinite(vector).all():
+        raise ValueError("embedding values must be finite numbers")
+    return vector
+
+
+# Base64 of little-endian float16 values on the wire; float32 vector after
+Fp16Vector = Annotated[
+    Base64Bytes,
+    Field(min_length=2 * EMBEDDING_DIM, max_length=2 * EMBEDDING_DIM),
+    AfterValidator(_from_fp16),
+]
+
+
 class ClusterItemRequest(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     id: str
     title: str
-    embedding: list[float]
+    # Exactly one of the two encodings. Wrong dimensions are rejected at
+    # parse time (422) rather than deep inside the clusterer.
+    embedding: Vector | None = None
+    # Base64 of little-endian float16 values — ~4x smaller than a JSON array
+    embedding_b16: Fp16Vector | None = None
+
+    @model_validator(mode="after")
+    def one_embedding(self) -> "ClusterItemRequest":
+        if (self.embedding is None) == (self.embedding_b16 is None):
+            raise ValueError("provide exactly one of embedding, embedding_b16")
+        return self
 
 
 class ClusterAssignmentResponse(BaseModel):
@@ -52,8 +179,9 @@ class ClusterTopicsResponse(BaseModel):
 # ─── Endpoints ────────────────────────────────────────────────────────────────
 
 
-_MODEL = "claude-haiku-4-5-20251001"
-_MAX_RETRIES = 2
+_MAX_RETRIES = 4
+_BACKOFF_BASE_SECONDS = 0.1
+_BACKOFF_CAP_SECONDS = 2.0
 
 
 # ─── Suggestions models ───────────────────────────────────────────────────────
@@ -74,6 +202,27 @@ class SuggestionsResponse(BaseModel):
     suggestions: list[str]
 
 
+# ─── Suggestions cache ────────────────────────────────────────────────────────
+
+# Prompt-input key → parsed suggestions (shared by the JSON and SSE endpoints)
+_suggestions_cache: ResponseCache[list[str]] = ResponseCache()
+
+
+def _weak_dims(body: SuggestionsRequest) -> tuple[tuple[str, str], ...]:
+    """Weak dimensions as rendered in the prompt — rounded, name-sorted."""
+    return tuple(
+        sorted((normalize(d.name), f"{d.value:.0f}") for d in body.weak_dimensions)
+    )
+
+
+def _suggestions_key(body: SuggestionsRequest) -> str:
+    """
+    Key on everything the prompt depends on: the brand and the weak
+    dimensions, order-insensitive and rounded the way the prompt renders them.
+    """
+    return cache_key("suggestions", normalize(body.project_name), _weak_dims(body))
+
+
 # ─── Suggestions endpoint ─────────────────────────────────────────────────────
 
 
@@ -85,54 +234,214 @@ async def generate_suggestions(
     """
     Generate 3-5 concrete Italian suggestions to improve weak AI Readiness dimensions.
     Falls back to an empty list on error — the caller handles the static fallback.
+    Successful responses are cached in-process for an hour (failures are not)
+    and concurrent identical requests share one LLM call.
     """
     if not settings.anthropic_api_key:
-        return SuggestionsResponse(suggestions=[])
+        return SuggestionsResponse.model_construct(suggestions=[])
 
-    dim_lines = "\n".join(
-        f"- {d.name}: {d.value:.0f}/100" for d in body.weak_dimensions
-    )
-    prompt = (
-        f"Brand: {body.project_name}\n"
-        f"Dimensioni deboli del AI Readiness Score (punteggio < 60):\n{dim_lines}\n\n"
-        "Genera da 3 a 5 suggerimenti concreti e pratici in italiano per migliorare "
-        "queste dimensioni. Ogni suggerimento deve essere una singola frase breve e "
-        "immediatamente actionable. Rispondi con una lista numerata, nient'altro."
+    # Same brand + same weak dimensions → same suggestions; skip the LLM
+    suggestions = await _suggestions_cache.get_or_compute(
+        _suggestions_key(body), lambda: _request_suggestions(body)
     )
+    return SuggestionsResponse.model_construct(suggestions=suggestions or [])
 
-    client: anthropic.AsyncAnthropic | None = None
+
+async def _request_suggestions(body: SuggestionsRequest) -> list[str] | None:
+    """Call Claude Haiku for suggestions. Returns None on failure."""
+    prompt = _suggestions_prompt(body)
     for attempt in range(_MAX_RETRIES):
         try:
-            if client is None:
-                client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
-            response = await client.messages.create(
-                model=_MODEL,
+            response = await fleet.submit(
+                latency_budget_ms=_INTERACTIVE_BUDGET_MS,
+                model=settings.anthropic_fast_model,
                 max_tokens=512,
+                system=_SUGGESTIONS_SYSTEM,
                 messages=[{"role": "user", "content": prompt}],
             )
-            raw = response.content[0].text.strip()
-            # Parse numbered list: "1. ...\n2. ..."
-            suggestions: list[str] = []
-            for line in raw.splitlines():
-                line = line.strip()
-                if not line:
-                    continue
-                # Remove leading "1. ", "- ", "• " etc.
-                import re
-                cleaned = re.sub(r"^[\d]+[.)]\s*|^[-•]\s*", "", line).strip()
-                if cleaned:
-                    suggestions.append(cleaned)
-            return SuggestionsResponse(suggestions=suggestions[:5])
-        except anthropic.RateLimitError:
-            import asyncio
+            return _parse_numbered_list(response.content[0].text) or None
+        except anthropic.RateLimitError as exc:
             if attempt < _MAX_RETRIES - 1:
-                await asyncio.sleep(2**attempt)
+                await asyncio.sleep(_rate_limit_wait(exc, attempt))
                 continue
         except Exception as exc:
             logger.warning("Suggestions generation failed: %s", exc)
             break
 
-    return SuggestionsResponse(suggestions=[])
+    return None
+
+
+# Instructions are request-independent: a cached system block, with only
+# the brand and its dimensions in the user turn.
+_SUGGESTIONS_SYSTEM: list[dict] = [
+    {
+        "type": "text",
+        "text": (
+            "Ricevi un brand e le dimensioni deboli del suo AI Readiness Score "
+            "(punteggio < 60). Genera da 3 a 5 suggerimenti concreti e pratici in "
+            "italiano per migliorare queste dimensioni. Ogni suggerimento deve "
+            "essere una singola frase breve e immediatamente actionable. "
+            "Rispondi con una lista numerata, nient'altro."
+        ),
+        "cache_control": {"type": "ephemeral"},
+    }
+]
+
+
+def _suggestions_prompt(body: SuggestionsRequest) -> str:
+    return _render_suggestions_prompt(body.project_name, _weak_dims(body))
+
+
+@lru_cache(maxsize=512)
+def _render_suggestions_prompt(
+    project_name: str, dims: tuple[tuple[str, str], ...]
+) -> str:
+    """
+    Weak dimensions only change when a project's score is recomputed, so
+    page refreshes re-send the same list — render each combination once.
+    """
+    dim_lines = "\n".join([f"- {name}: {value}/100" for name, value in dims])
+    return (
+        f"Brand: {project_name}\n"
+        f"Dimensioni deboli del AI Readiness Score (punteggio < 60):\n{dim_lines}"
+    )
+
+
+def _parse_numbered_list(raw: str) -> list[str]:
+    """Up to 5 items from a numbered/bulleted list reply, markers stripped."""
+    return list(islice(filter(None, map(_clean_line, raw.splitlines())), 5))
+
+
+def _clean_line(line: str) -> str:
+    """Strip whitespace and a leading list marker ("1. ", "2) ", "- ", "• ")."""
+    line = line.strip()
+    i = 0
+    n = len(line)
+    while i < n and line[i].isdecimal():
+        i += 1
+    if 0 < i < n and line[i] in ".)":
+        i += 1
+    elif line[:1] in ("-", "•"):
+        i = 1
+    else:
+        return line
+    return line[i:].strip()
+
+
+def _rate_limit_wait(exc: anthropic.RateLimitError, attempt: int) -> float:
+    """
+    Full-jitter backoff, so concurrent retriers spread across the rate-limit
+    window instead of waking together; never sooner than Retry-After.
+    """
+    delay = random.uniform(
+        0, min(_BACKOFF_CAP_SECONDS, _BACKOFF_BASE_SECONDS * 2**attempt)
+    )
+    try:
+        return max(float(exc.response.headers["retry-after"]), delay)
+    except (KeyError, ValueError):
+        return delay
+
+
+# ─── Suggestions streaming endpoint ───────────────────────────────────────────
+
+
+def _sse(payload: dict) -> bytes:
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+async def _stream_suggestions(body: SuggestionsRequest) -> AsyncIterator[bytes]:
+    if settings.anthropic_api_key:
+        async for suggestion in _suggestion_events(body):
+            yield _sse({"suggestion": suggestion})
+    yield b"data: [DONE]\n\n"
+
+
+async def _suggestion_events(body: SuggestionsRequest) -> AsyncIterator[str]:
+    """Suggestions from the cache, an in-flight call, or a fresh stream."""
+    key = _suggestions_key(body)
+    ready = _suggestions_cache.get(key)
+    if ready is None and (pending := _suggestions_cache.pending(key)) is not None:
+        ready = await asyncio.shield(pending)
+    if ready is not None:
+        for suggestion in ready:
+            yield suggestion
+        return
+
+    fut = _suggestions_cache.claim(key)
+    suggestions: list[str] = []
+    completed = False
+    try:
+        async for suggestion in _stream_suggestion_lines(body):
+            suggestions.append(suggestion)
+            yield suggestion
+        completed = True
+    except Exception as exc:
+        # The client keeps what it already got; the stream just ends
+        logger.warning("Suggestions streaming failed: %s", exc)
+    finally:
+        # Only a full answer is cached and shared — a failed or abandoned
+        # (GeneratorExit) stream must not publish a truncated list
+        complete = (completed and suggestions) or len(suggestions) >= 5
+        _suggestions_cache.release(key, fut, suggestions if complete else None)
+
+
+async def _stream_suggestion_lines(body: SuggestionsRequest) -> AsyncIterator[str]:
+    """
+    Yield each cleaned suggestion (max 5) as soon as its line is complete.
+    Rate limits are retried only before the first token has arrived; any
+    other failure propagates, so the caller can tell a cut-off stream from
+    a finished one.
+    """
+    prompt = _suggestions_prompt(body)
+    client = _get_client()
+    emitted = 0
+    for attempt in range(_MAX_RETRIES):
+        buffer = ""
+        try:
+            async with client.messages.stream(
+                model=settings.anthropic_fast_model,
+                max_tokens=512,
+                system=_SUGGESTIONS_SYSTEM,
+                messages=[{"role": "user", "content": prompt}],
+            ) as stream:
+                async for text in stream.text_stream:
+                    buffer += text
+                    *lines, buffer = buffer.split("\n")
+                    for cleaned in filter(None, map(_clean_line, lines)):
+                        yield cleaned
+                        emitted += 1
+                        if emitted == 5:
+                            return
+            cleaned = _clean_line(buffer)
+            if cleaned:
+                yield cleaned
+            return
+        except anthropic.RateLimitError as exc:
+            if emitted == 0 and attempt < _MAX_RETRIES - 1:
+                await asyncio.sleep(_rate_limit_wait(exc, attempt))
+                continue
+            raise
+
+
+@router.post("/suggestions/stream")
+async def stream_suggestions(
+    body: SuggestionsRequest,
+    _: None = Depends(verify_api_key),
+) -> StreamingResponse:
+    """
+    Streaming variant of /suggestions: each suggestion is flushed as soon as
+    its list line is complete, as data: {"suggestion": "..."}\n\n
+    Stream ends with: data: [DONE]\n\n (no suggestions on error — the caller
+    handles the static fallback, as with the JSON endpoint).
+    """
+    return StreamingResponse(
+        _stream_suggestions(body),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
 
 
 # ─── Content-suggestion models ───────────────────────────────────────────────
@@ -153,6 +462,8 @@ class ContentSuggestionResponse(BaseModel):
 
 # ─── Content-suggestion endpoint ──────────────────────────────────────────────
 
+_content_suggestion_cache: ResponseCache[list[str]] = ResponseCache()
+
 
 @router.post("/content-suggestion", response_model=ContentSuggestionResponse)
 async def generate_content_suggestion(
@@ -164,7 +475,7 @@ async def generate_content_suggestion(
     using Claude Haiku.  Falls back to an empty list on error.
     """
     if not settings.anthropic_api_key:
-        return ContentSuggestionResponse(id=body.id, suggestions=[])
+        return ContentSuggestionResponse.model_construct(id=body.id, suggestions=[])
 
     entities_str = (
         ", ".join(body.entities[:10]) if body.entities else "nessuna entità rilevata"
@@ -184,41 +495,42 @@ async def generate_content_suggestion(
         "su Y con esempi concreti'). Rispondi con una lista numerata, nient'altro."
     )
 
-    client: anthropic.AsyncAnthropic | None = None
+    # Same content + entities → same suggestions; skip the LLM
+    key = cache_key(
+        "content-suggestion",
+        normalize(body.project_name),
+        normalize(body.title),
+        normalize(truncated_text),
+        sorted(body.entities[:10]),
+    )
+    suggestions = await _content_suggestion_cache.get_or_compute(
+        key, lambda: _request_content_suggestions(prompt)
+    )
+    return ContentSuggestionResponse.model_construct(
+        id=body.id, suggestions=suggestions or []
+    )
+
+
+async def _request_content_suggestions(prompt: str) -> list[str] | None:
+    """Call Claude Haiku for content suggestions. Returns None on failure."""
     for attempt in range(_MAX_RETRIES):
         try:
-            if client is None:
-                client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
-            response = await client.messages.create(
-                model=_MODEL,
+            response = await fleet.submit(
+                latency_budget_ms=_BULK_BUDGET_MS,
+                model=settings.anthropic_fast_model,
                 max_tokens=512,
                 messages=[{"role": "user", "content": prompt}],
             )
-            raw = response.content[0].text.strip()
-            import re
-
-            suggestions: list[str] = []
-            for line in raw.splitlines():
-                line = line.strip()
-                if not line:
-                    continue
-                cleaned = re.sub(r"^[\d]+[.)]\s*|^[-•]\s*", "", line).strip()
-                if cleaned:
-                    suggestions.append(cleaned)
-            return ContentSuggestionResponse(
-                id=body.id, suggestions=suggestions[:5]
-            )
-        except anthropic.RateLimitError:
-            import asyncio
-
+            return _parse_numbered_list(response.content[0].text) or None
+        except anthropic.RateLimitError as exc:
             if attempt < _MAX_RETRIES - 1:
-                await asyncio.sleep(2**attempt)
+                await asyncio.sleep(_rate_limit_wait(exc, attempt))
                 continue
         except Exception as exc:
             logger.warning("Content suggestion generation failed: %s", exc)
             break
 
-    return ContentSuggestionResponse(id=body.id, suggestions=[])
+    return None
 
 
 # ─── Content-brief models ────────────────────────────────────────────────────
@@ -243,6 +555,33 @@ class ContentBriefResponse(BaseModel):
 
 # ─── Content-brief endpoint ───────────────────────────────────────────────────
 
+# Instructions and JSON schema are request-independent: a cached system
+# block, with only the gap and project data in the user turn.
+_BRIEF_SYSTEM: list[dict] = [
+    {
+        "type": "text",
+        "text": (
+            "Ricevi i dati di un progetto e di un gap nella sua presenza online. "
+            "Genera un brief strutturato per un nuovo contenuto che colmi questo gap. "
+            "Rispondi ESCLUSIVAMENTE con un oggetto JSON valido (nient'altro) con questa struttura:\n"
+            '{\n'
+            '  "title": "titolo proposto (max 80 caratteri)",\n'
+            '  "key_points": ["punto 1", "punto 2", "punto 3", "punto 4", "punto 5"],\n'
+            '  "entities": ["entità1", "entità2", "entità3"],\n'
+            '  "target_word_count": 800,\n'
+            '  "notes": "note aggiuntive brevi (opzionale, può essere null)"\n'
+            "}\n\n"
+            "I key_points devono essere 5 punti concreti da coprire nel contenuto. "
+            "Le entities devono essere 3-5 termini/nomi chiave da menzionare. "
+            "Il target_word_count deve essere appropriato per la piattaforma (blog: 800-1200, LinkedIn: 400-600, Twitter: 200). "
+            "Rispondi solo con JSON, senza markdown, senza testo extra."
+        ),
+        "cache_control": {"type": "ephemeral"},
+    }
+]
+
+_brief_cache: ResponseCache[ContentBriefResponse] = ResponseCache()
+
 
 @router.post("/content-brief", response_model=ContentBriefResponse)
 async def generate_content_brief(
@@ -280,71 +619,78 @@ async def generate_content_brief(
         f"Gap specifico: {body.gap_label}\n"
         f"Piattaforma target: {body.platform}\n"
         f"Entità chiave del progetto: {entities_str}\n"
-        f"Titoli di contenuti esistenti (stile di riferimento):\n{titles_str}\n\n"
-        "Genera un brief strutturato per un nuovo contenuto che colmi questo gap. "
-        "Rispondi ESCLUSIVAMENTE con un oggetto JSON valido (nient'altro) con questa struttura:\n"
-        '{\n'
-        '  "title": "titolo proposto (max 80 caratteri)",\n'
-        '  "key_points": ["punto 1", "punto 2", "punto 3", "punto 4", "punto 5"],\n'
-        '  "entities": ["entità1", "entità2", "entità3"],\n'
-        '  "target_word_count": 800,\n'
-        '  "notes": "note aggiuntive brevi (opzionale, può essere null)"\n'
-        "}\n\n"
-        "I key_points devono essere 5 punti concreti da coprire nel contenuto. "
-        "Le entities devono essere 3-5 termini/nomi chiave da menzionare. "
-        "Il target_word_count deve essere appropriato per la piattaforma (blog: 800-1200, LinkedIn: 400-600, Twitter: 200). "
-        "Rispondi solo con JSON, senza markdown, senza testo extra."
+        f"Titoli di contenuti esistenti (stile di riferimento):\n{titles_str}"
     )
 
-    import json
+    key = cache_key(
+        "content-brief",
+        body.gap_type,
+        normalize(body.gap_label),
+        body.platform,
+        normalize(body.project_name),
+        sorted(body.top_entities[:10]),
+        sorted(body.existing_titles[:3]),
+    )
+    brief = await _brief_cache.get_or_compute(
+        key, lambda: _request_brief(prompt, body.gap_label)
+    )
+    if brief is not None:
+        return brief
 
-    client: anthropic.AsyncAnthropic | None = None
+    return ContentBriefResponse(
+        title=f"Contenuto su {body.gap_label}",
+        key_points=[
+            "Introduzione all'argomento",
+            "Punti chiave e benefici",
+            "Esempi pratici e casi d'uso",
+            "Best practice e consigli",
+            "Conclusioni e prossimi passi",
+        ],
+        entities=body.top_entities[:3],
+        target_word_count=800,
+        notes="Brief generato con fallback statico — rigenera per un brief personalizzato.",
+    )
+
+
+async def _request_brief(prompt: str, gap_label: str) -> ContentBriefResponse | None:
+    """Call Claude Haiku for a content brief. Returns None on failure."""
     for attempt in range(_MAX_RETRIES):
         try:
-            if client is None:
-                client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
-            response = await client.messages.create(
-                model=_MODEL,
+            response = await fleet.submit(
+                latency_budget_ms=_INTERACTIVE_BUDGET_MS,
+                model=settings.anthropic_fast_model,
                 max_tokens=1024,
+                system=_BRIEF_SYSTEM,
                 messages=[{"role": "user", "content": prompt}],
             )
-            raw = response.content[0].text.strip()
-            # Strip possible markdown code fences
-            if raw.startswith("```"):
-                raw = raw.split("```")[1]
-                if raw.startswith("json"):
-                    raw = raw[4:]
-            parsed = json.loads(raw.strip())
+            parsed = orjson.loads(_strip_fences(response.content[0].text))
             return ContentBriefResponse(
-                title=str(parsed.get("title", f"Contenuto su {body.gap_label}")),
+                title=str(parsed.get("title", f"Contenuto su {gap_label}")),
                 key_points=[str(p) for p in parsed.get("key_points", [])[:5]],
                 entities=[str(e) for e in parsed.get("entities", [])[:5]],
                 target_word_count=parsed.get("target_word_count"),
                 notes=parsed.get("notes") or None,
             )
-        except anthropic.RateLimitError:
-            import asyncio
-
+        except anthropic.RateLimitError as exc:
             if attempt < _MAX_RETRIES - 1:
-                await asyncio.sleep(2**attempt)
+                await asyncio.sleep(_rate_limit_wait(exc, attempt))
                 continue
         except Exception as exc:
             logger.warning("Content brief generation failed: %s", exc)
             break
 
-    return ContentBriefResponse(
-        title=f"Contenuto su {body.gap_label}",
-        key_points=[
-            "Introduzione all'argomento",
-            "Punti chiave e benefici",
-            "Esempi pratici e casi d'uso",
-            "Best practice e consigli",
-            "Conclusioni e prossimi passi",
-        ],
-        entities=body.top_entities[:3],
-        target_word_count=800,
-        notes="Brief generato con fallback statico — rigenera per un brief personalizzato.",
-    )
+    return None
+
+
+def _strip_fences(raw: str) -> str:
+    """Body of a ```/```json fenced reply (one pass, no split), else raw."""
+    raw = raw.strip()
+    if raw.startswith("```"):
+        raw = raw[3:].removeprefix("json")
+        end = raw.find("```")
+        if end != -1:
+            raw = raw[:end]
+    return raw.strip()
 
 
 # ─── Cluster topics models ────────────────────────────────────────────────────
@@ -354,21 +700,92 @@ async def generate_content_brief(
 async def cluster_topics(
     body: ClusterTopicsRequest,
     _: None = Depends(verify_api_key),
-) -> ClusterTopicsResponse:
+) -> ORJSONResponse:
     """
     Cluster content items by embedding similarity and label each cluster.
 
     Requires at least 6 items; returns a soft error in the response body
-    (not an HTTP error) if the minimum is not met.
+    (not an HTTP error) if the minimum is not met. Each item carries either
+    `embedding` (JSON floats) or `embedding_b16` (base64 little-endian fp16).
     """
-    items = [ClusterItem(id=r.id, embedding=r.embedding) for r in body.items]
+    # Pack once at the boundary: one (n, d) float32 matrix instead of n lists.
+    # Dimensions were validated per item, so every row fits.
+    ids = [r.id for r in body.items]
     titles = {r.id: r.title for r in body.items}
+    embeddings = np.empty((len(ids), EMBEDDING_DIM), dtype=np.float32)
+    # Both encodings arrive as float32 vectors (fp16 is decoded at ingress)
+    for row, r in zip(embeddings, body.items):
+        row[:] = r.embedding if r.embedding is not None else r.embedding_b16
+
+    result = await _clusterer.cluster(ids, embeddings, titles)
+    return _cluster_response(result)
+
+
+@router.post("/topics/arrow", response_model=ClusterTopicsResponse)
+async def cluster_topics_arrow(
+    request: Request,
+    _: None = Depends(verify_api_key),
+) -> ORJSONResponse:
+    """
+    /topics with the items sent as an Arrow IPC stream
+    (application/vnd.apache.arrow.stream) instead of JSON: columns
+    `id: utf8`, `title: utf8`, `embedding: fixed_size_list<float32, dim>`.
+
+    Embeddings travel as raw float32 (~3x smaller than JSON text) and land
+    in the clustering matrix with one memcpy — no JSON or per-float parse.
+    Response is the same JSON as /topics. Needs pyarrow (501 otherwise).
+    """
+    if pa is None:
+        raise HTTPException(
+            status_code=501, detail="Arrow transport unavailable (pyarrow not installed)"
+        )
+    try:
+        ids, titles, embeddings = _read_arrow_items(await request.body())
+    except (pa.ArrowException, KeyError, ValueError) as exc:
+        raise HTTPException(status_code=422, detail=f"Invalid Arrow payload: {exc}")
+
+    result = await _clusterer.cluster(ids, embeddings, titles)
+    return _cluster_response(result)
+
+
+def _read_arrow_items(body: bytes) -> tuple[list[str], dict[str, str], np.ndarray]:
+    """Decode and check an Arrow /topics payload → (ids, titles, matrix)."""
+    table = pa.ipc.open_stream(body).read_all()
+    expected = {
+        "id": pa.string(),
+        "title": pa.string(),
+        "embedding": pa.list_(pa.float32(), EMBEDDING_DIM),
+    }
+    for name, type_ in expected.items():
+        actual = table.schema.field(name).type
+        if actual != type_:
+            raise ValueError(f"column {name!r} must be {type_}, got {actual}")
+
+    column = table.column("embedding").combine_chunks()
+    values = column.flatten()  # honours slicing offsets
+    if column.null_count or values.null_count or table.column("id").null_count:
+        raise ValueError("id and embedding must not contain nulls")
+
+    # The only copy: into a writable matrix, since the clusterer
+    # normalizes rows in place and Arrow buffers are read-only.
+    embeddings = np.array(
+        values.to_numpy(zero_copy_only=True), dtype=np.float32
+    ).reshape(-1, EMBEDDING_DIM)
+    if not np.isfinite(embeddings).all():
+        raise ValueError("embedding values must be finite numbers")
+
+    ids = table.column("id").to_pylist()
+    titles = {
+        i: t or "" for i, t in zip(ids, table.column("title").to_pylist())
+    }
+    return ids, titles, embeddings
 
-    result = await _clusterer.cluster(items, titles)
 
-    return ClusterTopicsResponse(
+def _cluster_response(result: ClusterResult) -> ORJSONResponse:
+    # Trusted clusterer output — skip validation in and out
+    response = ClusterTopicsResponse.model_construct(
         assignments=[
-            ClusterAssignmentResponse(
+            ClusterAssignmentResponse.model_construct(
                 id=a.id,
                 cluster_idx=a.cluster_idx,
                 topic_label=a.topic_label,
@@ -379,3 +796,4 @@ async def cluster_topics(
         clusters_found=result.clusters_found,
         error=result.error,
     )
+    return ORJSONResponse(response.model_dump())
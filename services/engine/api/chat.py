@@ -5,12 +5,14 @@ POST /api/chat/message — stateless conversational agent with streaming SSE.
 Context is injected via system prompt; no DB persistence.
 """
 
-import json
 import logging
 import os
+from functools import lru_cache
 from typing import AsyncIterator
 
 import anthropic
+import httpx
+import orjson
 from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
@@ -23,6 +25,40 @@ router = APIRouter(prefix="/api/chat", tags=["chat"])
 
 _MODEL = os.environ.get("CHAT_MODEL", "claude-haiku-4-5-20251001")
 
+# ─── Shared client ────────────────────────────────────────────────────────────
+
+# One HTTP/2 connection pool for every chat stream in the process:
+# concurrent streams multiplex over shared connections instead of each
+# paying its own TLS handshake before the first token.
+_LIMITS = httpx.Limits(
+    max_keepalive_connections=64, max_connections=256, keepalive_expiry=60.0
+)
+# Streams are long-lived (generous read), but a saturated pool or a slow
+# connect should fail fast rather than back up new chats.
+_TIMEOUT = httpx.Timeout(connect=5.0, read=120.0, write=10.0, pool=5.0)
+
+_client: anthropic.AsyncAnthropic | None = None
+
+
+def _get_client(api_key: str) -> anthropic.AsyncAnthropic:
+    global _client
+    if _client is None:
+        _client = anthropic.AsyncAnthropic(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(
+                http2=True, limits=_LIMITS, timeout=_TIMEOUT
+            ),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Release the shared pool (called from the app lifespan)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
 
 # ─── Request models ────────────────────────────────────────────────────────────
 
@@ -56,64 +92,122 @@ class ChatRequest(BaseModel):
 # ─── System prompt builder ────────────────────────────────────────────────────
 
 
-def _build_system_prompt(ctx: ChatContext) -> str:
+_DIM_LABELS = {
+    "copertura": "Copertura piattaforme",
+    "profondita": "Profondità contenuto",
+    "freschezza": "Freschezza",
+    "autorita": "Autorevolezza",
+    "coerenza": "Coerenza entità",
+}
+
+# The score always carries these five dimensions in this order: render them
+# with one format_map call from a template built once from the labels.
+_DIM_KEYS = tuple(_DIM_LABELS)
+_DIM_BLOCK = "Dimensioni dello score:\n" + "\n".join(
+    [f"  - {label}: {{{key}:.0f}}/100" for key, label in _DIM_LABELS.items()]
+)
+
+_GUIDELINES = "\n".join(
+    [
+        "",
+        "Linee guida:",
+        "- Sii specifico e actionable, non generico",
+        "- Quando suggerisci azioni, indica piattaforma e tipo di contenuto",
+        "- Se i dati mostrano gap critici, menzionali proattivamente",
+        "- Tieni le risposte concise (max 3-4 paragrafi o lista breve)",
+    ]
+)
+
+
+@lru_cache(maxsize=256)
+def _context_header(
+    project_name: str,
+    overall_score: float | None,
+    dimensions: tuple[tuple[str, float], ...],
+    top_entities: tuple[str, ...],
+) -> str:
+    """
+    Role, score, dimensions, entities and guidelines — fixed for a project
+    between score recomputations, so rendered once and reused across its
+    chats (and cached by the API as the system prompt prefix).
+    """
     lines = [
-        f"Sei un esperto di content strategy e AI visibility per il brand '{ctx.project_name}'.",
+        f"Sei un esperto di content strategy e AI visibility per il brand '{project_name}'.",
         "Rispondi sempre in italiano, in modo conciso e orientato all'azione.",
         "Hai accesso ai dati del content portfolio del brand. Usa queste informazioni per dare risposte contestualizzate.",
         "",
     ]
 
-    if ctx.overall_score is not None:
-        lines.append(f"AI Readiness Score globale: {ctx.overall_score:.0f}/100")
+    if overall_score is not None:
+        lines.append(f"AI Readiness Score globale: {overall_score:.0f}/100")
 
-    if ctx.dimensions:
+    if dimensions and tuple(k for k, _ in dimensions) == _DIM_KEYS:
+        lines.append(_DIM_BLOCK.format_map(dict(dimensions)))
+    elif dimensions:
+        # Partial or reordered schema — generic path
         lines.append("Dimensioni dello score:")
-        dim_labels = {
-            "copertura": "Copertura piattaforme",
-            "profondita": "Profondità contenuto",
-            "freschezza": "Freschezza",
-            "autorita": "Autorevolezza",
-            "coerenza": "Coerenza entità",
-        }
-        for k, v in ctx.dimensions.items():
-            label = dim_labels.get(k, k)
-            lines.append(f"  - {label}: {v:.0f}/100")
-
-    if ctx.top_entities:
-        lines.append(f"\nEntità principali del brand: {', '.join(ctx.top_entities[:10])}")
+        lines += [f"  - {_DIM_LABELS.get(k, k)}: {v:.0f}/100" for k, v in dimensions]
+
+    if top_entities:
+        lines.append(f"\nEntità principali del brand: {', '.join(top_entities)}")
 
+    lines.append(_GUIDELINES)
+    return "\n".join(lines)
+
+
+def _build_system_prompt(ctx: ChatContext) -> list[dict]:
+    """
+    Two system blocks: the per-project header, marked as a prompt-cache
+    breakpoint, then the gaps and content relevant to this message.
+    """
+    header = _context_header(
+        ctx.project_name,
+        ctx.overall_score,
+        tuple(ctx.dimensions.items()) if ctx.dimensions else (),
+        tuple(ctx.top_entities[:10]),
+    )
+    blocks: list[dict] = [
+        {"type": "text", "text": header, "cache_control": {"type": "ephemeral"}}
+    ]
+
+    lines: list[str] = []
     if ctx.recent_gaps:
-        lines.append("\nGap critici rilevati:")
-        for gap in ctx.recent_gaps[:3]:
-            lines.append(f"  - {gap}")
+        lines.append("Gap critici rilevati:")
+        lines += [f"  - {gap}" for gap in ctx.recent_gaps[:3]]
 
     if ctx.relevant_content:
-        lines.append("\nContenuti più rilevanti alla domanda dell'utente:")
+        if lines:
+            lines.append("")
+        lines.append("Contenuti più rilevanti alla domanda dell'utente:")
         for rc in ctx.relevant_content[:3]:
             excerpt = f" — {rc.excerpt}" if rc.excerpt else ""
             lines.append(f"  - [{rc.score}%] {rc.title}{excerpt}")
 
-    lines += [
-        "",
-        "Linee guida:",
-        "- Sii specifico e actionable, non generico",
-        "- Quando suggerisci azioni, indica piattaforma e tipo di contenuto",
-        "- Se i dati mostrano gap critici, menzionali proattivamente",
-        "- Tieni le risposte concise (max 3-4 paragrafi o lista breve)",
-    ]
-
-    return "\n".join(lines)
+    # The API rejects empty text blocks
+    if lines:
+        blocks.append({"type": "text", "text": "\n".join(lines)})
+    return blocks
 
 
 # ─── Streaming generator ──────────────────────────────────────────────────────
 
 
-async def _stream_chat(req: ChatRequest) -> AsyncIterator[str]:
+def _sse(payload: dict) -> bytes:
+    # Bytes straight from orjson — StreamingResponse sends them as-is
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+_DONE = b"data: [DONE]\n\n"
+_ERR_NO_KEY = _sse({"error": "ANTHROPIC_API_KEY non configurata"})
+_ERR_RATE_LIMIT = _sse({"error": "Rate limit raggiunto. Riprova tra qualche secondo."})
+_ERR_STREAM = _sse({"error": "Errore durante la generazione della risposta."})
+
+
+async def _stream_chat(req: ChatRequest) -> AsyncIterator[bytes]:
     anthropic_key = os.environ.get("ANTHROPIC_API_KEY", "")
     if not anthropic_key:
-        yield f"data: {json.dumps({'error': 'ANTHROPIC_API_KEY non configurata'})}\n\n"
-        yield "data: [DONE]\n\n"
+        yield _ERR_NO_KEY
+        yield _DONE
         return
 
     system_prompt = _build_system_prompt(req.context)
@@ -126,7 +220,7 @@ async def _stream_chat(req: ChatRequest) -> AsyncIterator[str]:
     ]
     messages.append({"role": "user", "content": req.message})
 
-    client = anthropic.AsyncAnthropic(api_key=anthropic_key)
+    client = _get_client(anthropic_key)
 
     try:
         async with client.messages.stream(
@@ -136,17 +230,17 @@ async def _stream_chat(req: ChatRequest) -> AsyncIterator[str]:
             messages=messages,
         ) as stream:
             async for text in stream.text_stream:
-                yield f"data: {json.dumps({'token': text})}\n\n"
+                yield _sse({"token": text})
     except anthropic.RateLimitError:
-        yield f"data: {json.dumps({'error': 'Rate limit raggiunto. Riprova tra qualche secondo.'})}\n\n"
+        yield _ERR_RATE_LIMIT
     except anthropic.APIStatusError as e:
         logger.warning("Chat API error: %s", e)
-        yield f"data: {json.dumps({'error': f'Errore API ({e.status_code}). Riprova.'})}\n\n"
+        yield _sse({"error": f"Errore API ({e.status_code}). Riprova."})
     except Exception as e:
         logger.warning("Chat stream error: %s", e)
-        yield f"data: {json.dumps({'error': 'Errore durante la generazione della risposta.'})}\n\n"
+        yield _ERR_STREAM
     finally:
-        yield "data: [DONE]\n\n"
+        yield _DONE
 
 
 # ─── Endpoint ──────────────────────────────────────────────────────────────────
@@ -1,4 +1,8 @@
+from collections.abc import AsyncIterator
+
+import orjson
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, HttpUrl, field_validator
 
 from agents.crawler import CrawlerAgent, CrawlResult, ExtractResult, PageData, extract_urls
@@ -19,6 +23,9 @@ class CrawlSiteRequest(BaseModel):
     max_depth: int = 2
     max_pages: int = 50
     rate_limit: float = 1.0  # requests per second
+    concurrency: int = 5
+    # False → raw_content is null; for callers that only need page metadata
+    include_raw_content: bool = True
 
     @field_validator("max_depth")
     @classmethod
@@ -35,6 +42,11 @@ class CrawlSiteRequest(BaseModel):
     def clamp_rate(cls, v: float) -> float:
         return max(0.1, min(v, 10.0))
 
+    @field_validator("concurrency")
+    @classmethod
+    def clamp_concurrency(cls, v: int) -> int:
+        return max(1, min(v, 10))
+
 
 class PageResult(BaseModel):
     url: str
@@ -57,26 +69,29 @@ class CrawlSiteResponse(BaseModel):
 
 
 @router.post("/site", response_model=CrawlSiteResponse)
-async def crawl_site(req: CrawlSiteRequest) -> CrawlSiteResponse:
+async def crawl_site(req: CrawlSiteRequest) -> ORJSONResponse:
     """
     Crawl a website starting from the given URL.
 
     Follows internal links up to `max_depth` levels, extracts text content
     and metadata from each page. Protected by X-Engine-API-Key header.
     """
-    agent = CrawlerAgent(rate_limit=req.rate_limit)
+    agent = CrawlerAgent(rate_limit=req.rate_limit, concurrency=req.concurrency)
     result: CrawlResult = await agent.crawl(
         start_url=req.url,
         max_depth=req.max_depth,
         max_pages=req.max_pages,
     )
 
+    # The crawler's dataclasses are already well-typed: build the response
+    # without validation, and return it directly so FastAPI does not
+    # re-validate up to 200 pages of content on the way out.
     pages = [
-        PageResult(
+        PageResult.model_construct(
             url=p.url,
             title=p.title,
             description=p.description,
-            raw_content=p.raw_content,
+            raw_content=p.raw_content if req.include_raw_content else None,
             word_count=p.word_count,
             excerpt=p.excerpt,
             published_at=p.published_at,
@@ -84,12 +99,57 @@ async def crawl_site(req: CrawlSiteRequest) -> CrawlSiteResponse:
         for p in result.pages
     ]
 
-    return CrawlSiteResponse(
+    response = CrawlSiteResponse.model_construct(
         pages=pages,
         crawled_count=result.crawled_count,
         error_count=result.error_count,
         errors=result.errors,
     )
+    return ORJSONResponse(response.model_dump())
+
+
+async def _ndjson_crawl(req: CrawlSiteRequest) -> AsyncIterator[bytes]:
+    agent = CrawlerAgent(rate_limit=req.rate_limit, concurrency=req.concurrency)
+    crawled = errors = 0
+    async for url, page, error in agent.crawl_stream(
+        start_url=req.url,
+        max_depth=req.max_depth,
+        max_pages=req.max_pages,
+    ):
+        if error:
+            errors += 1
+            line = {"type": "error", "url": url, "error": error}
+        elif page is not None:
+            crawled += 1
+            line = {
+                "type": "page",
+                "url": page.url,
+                "title": page.title,
+                "description": page.description,
+                "raw_content": page.raw_content if req.include_raw_content else None,
+                "word_count": page.word_count,
+                "excerpt": page.excerpt,
+                "published_at": page.published_at,
+            }
+        else:
+            continue
+        yield orjson.dumps(line) + b"\n"
+    yield orjson.dumps(
+        {"type": "done", "crawled_count": crawled, "error_count": errors}
+    ) + b"\n"
+
+
+@router.post("/site/stream")
+async def crawl_site_stream(req: CrawlSiteRequest) -> StreamingResponse:
+    """
+    Streaming variant of /site: one JSON object per line (NDJSON) as pages
+    are crawled, so neither side holds the whole crawl in memory.
+
+    Lines are {"type": "page", ...PageResult fields}, {"type": "error",
+    "url": ..., "error": ...}, and a final {"type": "done", "crawled_count":
+    ..., "error_count": ...}. Closing the connection stops the crawl.
+    """
+    return StreamingResponse(_ndjson_crawl(req), media_type="application/x-ndjson")
 
 
 # ─── /extract ─────────────────────────────────────────────────────────────────
@@ -127,7 +187,7 @@ class ExtractResponse(BaseModel):
 
 
 @router.post("/extract", response_model=ExtractResponse)
-async def extract_content(req: ExtractRequest) -> ExtractResponse:
+async def extract_content(req: ExtractRequest) -> ORJSONResponse:
     """
     Fetch and extract clean text content from one or more URLs.
 
@@ -138,9 +198,10 @@ async def extract_content(req: ExtractRequest) -> ExtractResponse:
     results: list[ExtractResult] = await extract_urls(
         req.urls, concurrency=req.concurrency
     )
-    return ExtractResponse(
+    # Trusted agent output — skip validation in and out, as in /site
+    response = ExtractResponse.model_construct(
         results=[
-            ExtractResultItem(
+            ExtractResultItem.model_construct(
                 url=r.url,
                 title=r.title,
                 raw_content=r.raw_content,
@@ -152,3 +213,4 @@ async def extract_content(req: ExtractRequest) -> ExtractResponse:
             for r in results
         ]
     )
+    return ORJSONResponse(response.model_dump())
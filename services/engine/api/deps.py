@@ -1,11 +1,18 @@
+import hmac
+
 from fastapi import Header, HTTPException
 
 from config import settings
 
+# Encoded once at import; settings are not reloaded at runtime
+_EXPECTED_KEY = settings.engine_api_key.encode()
+
 
 async def verify_api_key(
     x_engine_api_key: str | None = Header(default=None, alias="x-engine-api-key"),
 ) -> None:
-    """Verify the shared API key sent by the Next.js app."""
-    if not x_engine_api_key or x_engine_api_key != settings.engine_api_key:
+    """Verify the shared API key sent by the Next.js app (constant-time)."""
+    if not x_engine_api_key or not hmac.compare_digest(
+        x_engine_api_key.encode(), _EXPECTED_KEY
+    ):
         raise HTTPException(status_code=401, detail="Invalid or missing API key")
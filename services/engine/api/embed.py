@@ -2,23 +2,65 @@
 Embedding API
 
 POST /api/embed/batch — generate vector embeddings for a list of text items.
-POST /api/embed/query — generate a single embedding for a search query.
+POST /api/embed/query — generate a single embedding for a search query
+(cached per whitespace-normalised query text).
 Uses fastembed with paraphrase-multilingual-MiniLM-L12-v2 (384 dims).
 Max 100 items per request (batch).
+
+Both endpoints take an optional `precision`:
+  "fp32"   (default) — `embedding` is a list of floats
+  "int8"   — base64 of 384 int8 values; divide by 127 to get the
+             (unit-norm) float vector back
+  "binary" — base64 of 48 bytes, one sign bit per dimension (MSB first,
+             numpy.packbits order); compare with Hamming distance
 """
 
+import base64
+from typing import Literal
+
+import numpy as np
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, field_validator
 
-from agents.embedder import EmbedderAgent, EmbedRequest, EmbedResult
+from agents.embedder import EMBEDDING_DIM, EmbedderAgent, EmbedRequest
 from api.deps import verify_api_key
+from api.llm_cache import ResponseCache, cache_key, normalize
 
 router = APIRouter(
     prefix="/api/embed",
     tags=["Embed"],
     dependencies=[Depends(verify_api_key)],
+    default_response_class=ORJSONResponse,
 )
 
+# Shared across requests; the model itself is loaded (and warmed) by the
+# app lifespan rather than on the first call
+embedder_agent = EmbedderAgent()
+
+
+Precision = Literal["fp32", "int8", "binary"]
+
+_DTYPES: dict[str, str] = {"fp32": "float32", "int8": "int8", "binary": "ubinary"}
+# Embeddings are L2-normalised, so every component lies in [-1, 1]
+_INT8_SCALE = 127
+
+
+def _encode(matrix: np.ndarray, precision: Precision) -> np.ndarray | list[str]:
+    """
+    Wire form of each row: the float32 matrix itself (orjson serialises
+    NumPy arrays natively), or base64 of the quantized bytes per row.
+    Quantization runs once over the whole matrix.
+    """
+    if precision == "fp32":
+        return matrix
+    if precision == "int8":
+        scaled = np.clip(np.rint(matrix * _INT8_SCALE), -_INT8_SCALE, _INT8_SCALE)
+        packed = scaled.astype(np.int8)
+    else:
+        packed = np.packbits(matrix > 0, axis=1)
+    return [base64.b64encode(row.tobytes()).decode("ascii") for row in packed]
+
 
 # ─── Request / Response models ────────────────────────────────────────────────
 
@@ -30,12 +72,13 @@ class EmbedItemRequest(BaseModel):
 
 class EmbedItemResponse(BaseModel):
     id: str
-    embedding: list[float]
+    embedding: list[float] | str
     error: str | None = None
 
 
 class EmbedBatchRequest(BaseModel):
     items: list[EmbedItemRequest]
+    precision: Precision = "fp32"
 
     @field_validator("items")
     @classmethod
@@ -47,25 +90,26 @@ class EmbedBatchRequest(BaseModel):
 
 class EmbedBatchResponse(BaseModel):
     results: list[EmbedItemResponse]
-    dimensions: int = 384
+    dimensions: int = EMBEDDING_DIM
+    dtype: str = "float32"
 
 
 # ─── Endpoint ─────────────────────────────────────────────────────────────────
 
 
 @router.post("/batch", response_model=EmbedBatchResponse)
-async def embed_batch(req: EmbedBatchRequest) -> EmbedBatchResponse:
+async def embed_batch(req: EmbedBatchRequest) -> ORJSONResponse:
     """
     Generate 384-dimensional embeddings for a list of text items.
 
     Uses paraphrase-multilingual-MiniLM-L12-v2 via fastembed (ONNX, CPU).
-    The model is loaded on first call and cached for subsequent requests.
+    The model is loaded and warmed at startup.
     Protected by X-Engine-API-Key header.
     """
-    agent = EmbedderAgent()
+    agent = embedder_agent
 
     if not agent.is_configured():
-        return EmbedBatchResponse(
+        unavailable = EmbedBatchResponse(
             results=[
                 EmbedItemResponse(
                     id=item.id,
@@ -73,21 +117,30 @@ async def embed_batch(req: EmbedBatchRequest) -> EmbedBatchResponse:
                     error="fastembed not installed",
                 )
                 for item in req.items
-            ]
+            ],
+            dtype=_DTYPES[req.precision],
         )
+        return ORJSONResponse(unavailable.model_dump())
 
     embed_requests = [EmbedRequest(id=item.id, text=item.text) for item in req.items]
-    results: list[EmbedResult] = await agent.embed_batch(embed_requests)
-
-    return EmbedBatchResponse(
-        results=[
-            EmbedItemResponse(
-                id=r.id,
-                embedding=r.embedding,
-                error=r.error,
-            )
-            for r in results
+    batch = await agent.embed_batch(embed_requests)
+
+    if batch.error is None:
+        rows = [
+            {"id": id_, "embedding": emb, "error": None}
+            for id_, emb in zip(batch.ids, _encode(batch.embeddings, req.precision))
         ]
+    else:
+        rows = [{"id": id_, "embedding": [], "error": batch.error} for id_ in batch.ids]
+
+    # Plain dicts straight to orjson: a pydantic model would box every
+    # component into a Python float before serialising it
+    return ORJSONResponse(
+        {
+            "results": rows,
+            "dimensions": EMBEDDING_DIM,
+            "dtype": _DTYPES[req.precision],
+        }
     )
 
 
@@ -96,26 +149,39 @@ async def embed_batch(req: EmbedBatchRequest) -> EmbedBatchResponse:
 
 class EmbedQueryRequest(BaseModel):
     text: str
+    precision: Precision = "fp32"
 
 
 class EmbedQueryResponse(BaseModel):
-    embedding: list[float]
+    embedding: list[float] | str
+    dtype: str = "float32"
+
+
+# Search-box queries repeat heavily; a hit skips the forward pass entirely
+_query_cache: ResponseCache[np.ndarray] = ResponseCache(maxsize=4_096)
 
 
 @router.post("/query", response_model=EmbedQueryResponse)
-async def embed_query(req: EmbedQueryRequest) -> EmbedQueryResponse:
+async def embed_query(req: EmbedQueryRequest) -> ORJSONResponse:
     """
     Generate a single 384-dimensional embedding for a search query string.
     Used by the semantic search feature on the Next.js side.
     """
-    agent = EmbedderAgent()
+    agent = embedder_agent
 
+    dtype = _DTYPES[req.precision]
     if not agent.is_configured():
-        return EmbedQueryResponse(embedding=[])
+        return ORJSONResponse({"embedding": [], "dtype": dtype})
 
-    results = await agent.embed_batch(
-        [EmbedRequest(id="query", text=req.text.strip())]
-    )
-    if results and results[0].embedding:
-        return EmbedQueryResponse(embedding=results[0].embedding)
-    return EmbedQueryResponse(embedding=[])
+    text = normalize(req.text)
+
+    async def compute() -> np.ndarray | None:
+        batch = await agent.embed_batch([EmbedRequest(id="query", text=text)])
+        # Copy the row so the cache doesn't pin the whole shared batch matrix
+        return batch.embeddings[0].copy() if len(batch.embeddings) else None
+
+    vec = await _query_cache.get_or_compute(cache_key("query", text), compute)
+    if vec is not None:
+        embedding = _encode(vec[np.newaxis], req.precision)[0]
+        return ORJSONResponse({"embedding": embedding, "dtype": dtype})
+    return ORJSONResponse({"embedding": [], "dtype": dtype})
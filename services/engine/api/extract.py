@@ -2,11 +2,13 @@
 Entity Extraction API
 
 POST /api/extract/entities — extract named entities from a list of content items.
-Items are processed sequentially (one Claude Haiku call each) to respect
-API rate limits. Max 50 items per request.
+Items are processed concurrently (one Claude Haiku call each, a bounded
+number in flight), or as one Message Batch when `extract_use_batches` is on.
+Max 50 items per request.
 """
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, field_validator
 
 from agents.extractor import EntityExtractorAgent, ItemExtractionResult
@@ -18,6 +20,9 @@ router = APIRouter(
     dependencies=[Depends(verify_api_key)],
 )
 
+# Stateless, so one instance serves every request
+extractor_agent = EntityExtractorAgent()
+
 
 # ─── Request / Response models ────────────────────────────────────────────────
 
@@ -64,15 +69,15 @@ class ExtractEntitiesResponse(BaseModel):
 @router.post("/entities", response_model=ExtractEntitiesResponse)
 async def extract_entities(
     req: ExtractEntitiesRequest,
-) -> ExtractEntitiesResponse:
+) -> ExtractEntitiesResponse | ORJSONResponse:
     """
     Extract named entities from content items using Claude Haiku.
 
-    Processes items sequentially (one LLM call each).
+    Processes items concurrently (one LLM call each, bounded in flight).
     Returns one result per input item — check the `error` field for failures.
     Protected by X-Engine-API-Key header.
     """
-    agent = EntityExtractorAgent()
+    agent = extractor_agent
 
     if not agent.is_configured():
         return ExtractEntitiesResponse(
@@ -86,27 +91,27 @@ async def extract_entities(
             ]
         )
 
-    results: list[ItemExtractionResponse] = []
-    for item in req.items:
-        result: ItemExtractionResult = await agent.extract(
-            content_id=item.id,
-            title=item.title,
-            text=item.text,
-        )
-        results.append(
-            ItemExtractionResponse(
-                id=result.content_id,
-                entities=[
-                    EntityItem(
-                        label=e.label,
-                        type=e.type,
-                        salience=e.salience,
-                        context=e.context,
-                    )
-                    for e in result.entities
-                ],
-                error=result.error,
-            )
+    extracted: list[ItemExtractionResult] = await agent.extract_many(
+        [(item.id, item.title, item.text) for item in req.items]
+    )
+    # The agent already coerces every field (types, salience range, context
+    # length) — skip validation in and out, as in /api/crawl
+    results = [
+        ItemExtractionResponse.model_construct(
+            id=result.content_id,
+            entities=[
+                EntityItem.model_construct(
+                    label=e.label,
+                    type=e.type,
+                    salience=e.salience,
+                    context=e.context,
+                )
+                for e in result.entities
+            ],
+            error=result.error,
         )
+        for result in extracted
+    ]
 
-    return ExtractEntitiesResponse(results=results)
+    response = ExtractEntitiesResponse.model_construct(results=results)
+    return ORJSONResponse(response.model_dump())
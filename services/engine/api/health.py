@@ -1,11 +1,22 @@
 import time
+from functools import lru_cache
 
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
 from pydantic import BaseModel
 
 router = APIRouter(tags=["Health"])
 
-_START_TIME = time.time()
+# Monotonic: uptime is unaffected by wall-clock adjustments
+_START = time.monotonic()
+# Set by the app lifespan once startup warmup (embedding model) has finished
+_ready = False
+
+
+def mark_ready() -> None:
+    global _ready
+    _ready = True
 
 
 class HealthResponse(BaseModel):
@@ -15,11 +26,28 @@ class HealthResponse(BaseModel):
     uptime_seconds: float
 
 
-@router.get("/health", response_model=HealthResponse)
-async def health() -> HealthResponse:
-    return HealthResponse(
-        status="ok",
-        service="visiblee-engine",
-        version="0.1.0",
-        uptime_seconds=round(time.time() - _START_TIME, 1),
+@lru_cache(maxsize=1)
+def _health_body(uptime_tenths: int) -> bytes:
+    # Uptime is reported to 0.1 s, so probes within one tenth share a body
+    return orjson.dumps(
+        {
+            "status": "ok",
+            "service": "visiblee-engine",
+            "version": "0.1.0",
+            "uptime_seconds": uptime_tenths / 10,
+        }
     )
+
+
+@router.get("/health", response_model=HealthResponse)
+async def health() -> Response:
+    tenths = round((time.monotonic() - _START) * 10)
+    return Response(_health_body(tenths), media_type="application/json")
+
+
+@router.get("/ready")
+async def ready() -> dict[str, str]:
+    """Readiness probe: 503 until the startup warmup has finished."""
+    if not _ready:
+        raise HTTPException(status_code=503, detail="Warming up")
+    return {"status": "ready"}
@@ -0,0 +1,105 @@
+"""
+LLM response cache
+
+In-process TTL + LRU cache for parsed Claude responses, keyed on a canonical
+hash of the prompt inputs. Concurrent identical requests share one in-flight
+call (single-flight); failed calls are never cached.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+_DEFAULT_SIZE = 1_024
+_DEFAULT_TTL = 3_600.0  # seconds
+
+
+def normalize(text: str) -> str:
+    """Collapse whitespace so trivially different payloads share a key."""
+    return " ".join(text.split())
+
+
+def cache_key(*parts: object) -> str:
+    """BLAKE2b of the canonical JSON encoding of the prompt inputs."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class ResponseCache(Generic[T]):
+    """
+    Maps prompt keys to parsed responses for `ttl` seconds, evicting the
+    least recently used entry beyond `maxsize`. All operations run on the
+    event loop without awaiting, so no lock is needed.
+    """
+
+    def __init__(
+        self, maxsize: int = _DEFAULT_SIZE, ttl: float = _DEFAULT_TTL
+    ) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        # key → (expiry on the monotonic clock, value)
+        self._entries: OrderedDict[str, tuple[float, T]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future[T | None]] = {}
+
+    def get(self, key: str) -> T | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: T) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def pending(self, key: str) -> "asyncio.Future[T | None] | None":
+        """The in-flight call for `key`, if another request is computing it."""
+        return self._inflight.get(key)
+
+    def claim(self, key: str) -> "asyncio.Future[T | None]":
+        """Register the caller as the one computing `key`; see `release`."""
+        fut: asyncio.Future[T | None] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        return fut
+
+    def release(
+        self, key: str, fut: "asyncio.Future[T | None]", value: T | None
+    ) -> None:
+        """Publish the result of a claimed key (None = failure, not cached)."""
+        if value is not None:
+            self.put(key, value)
+        if self._inflight.get(key) is fut:
+            del self._inflight[key]
+        fut.set_result(value)
+
+    async def get_or_compute(
+        self, key: str, compute: Callable[[], Awaitable[T | None]]
+    ) -> T | None:
+        """Cached value, else join the in-flight call, else run `compute`."""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        fut = self.pending(key)
+        if fut is not None:
+            return await asyncio.shield(fut)
+
+        fut = self.claim(key)
+        value = None
+        try:
+            value = await compute()
+        finally:
+            self.release(key, fut, value)
+        return value
@@ -1,30 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+import hashlib
+from functools import lru_cache
+
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel, field_validator
 
-from agents.search import SearchAgent, build_query
+from agents.search import PLATFORMS, SearchAgent, build_query
 from api.deps import verify_api_key
 
 router = APIRouter(
     prefix="/api/search",
     tags=["Search"],
     dependencies=[Depends(verify_api_key)],
+    default_response_class=ORJSONResponse,
 )
 
 # Platforms the search agent understands
-VALID_PLATFORMS = frozenset(
-    {
-        "SUBSTACK",
-        "MEDIUM",
-        "LINKEDIN",
-        "REDDIT",
-        "YOUTUBE",
-        "TWITTER",
-        "QUORA",
-        "NEWS",
-        "WEBSITE",
-        "OTHER",
-    }
-)
+VALID_PLATFORMS = PLATFORMS
+_SORTED_PLATFORMS = tuple(sorted(VALID_PLATFORMS))
+
+# Shared across requests: keeps the Brave connection pool warm and the call
+# pacing per API key rather than per request. Closed by the app lifespan.
+search_agent = SearchAgent()
 
 
 # ─── Request / Response models ────────────────────────────────────────────────
@@ -49,8 +47,9 @@ class SearchPlatformRequest(BaseModel):
     def validate_platforms(cls, v: list[str]) -> list[str]:
         if not v:
             raise ValueError("at least one platform is required")
-        invalid = [p for p in v if p not in VALID_PLATFORMS]
-        if invalid:
+        # One C-level subset check; the error list is only built on failure
+        if not VALID_PLATFORMS.issuperset(v):
+            invalid = [p for p in v if p not in VALID_PLATFORMS]
             raise ValueError(f"unknown platforms: {invalid}")
         return v
 
@@ -79,12 +78,12 @@ class SearchPlatformResponse(BaseModel):
 @router.post("/platform", response_model=SearchPlatformResponse)
 async def search_platform(req: SearchPlatformRequest) -> SearchPlatformResponse:
     """
-    Search for brand mentions across one or more platforms via Google CSE.
+    Search for brand mentions across one or more platforms via Brave Search.
 
-    Requires GOOGLE_CSE_API_KEY and GOOGLE_CSE_ID to be configured.
+    Requires BRAVE_SEARCH_API_KEY to be configured.
     Protected by X-Engine-API-Key header.
     """
-    agent = SearchAgent()
+    agent = search_agent
     if not agent.is_configured():
         raise HTTPException(
             status_code=503,
@@ -118,16 +117,33 @@ async def search_platform(req: SearchPlatformRequest) -> SearchPlatformResponse:
     )
 
 
-@router.get("/platform/preview")
+@lru_cache(maxsize=512)
+def _preview(brand: str, domain: str | None) -> tuple[bytes, str]:
+    # Serialised once per (brand, domain); bytes are safe to share
+    body = orjson.dumps(
+        {
+            platform: build_query(platform, brand, domain)
+            for platform in _SORTED_PLATFORMS
+        }
+    )
+    etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+    return body, etag
+
+
+@router.get("/platform/preview", response_model=dict[str, str | None])
 async def preview_queries(
     brand: str,
     domain: str | None = None,
-) -> dict[str, str | None]:
+    if_none_match: str | None = Header(default=None),
+) -> Response:
     """
     Preview the search queries that would be generated for each platform.
     Useful for debugging. Protected by X-Engine-API-Key header.
+
+    Sends an ETag; a matching If-None-Match gets an empty 304.
     """
-    return {
-        platform: build_query(platform, brand, domain)
-        for platform in sorted(VALID_PLATFORMS)
-    }
+    body, etag = _preview(brand, domain)
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=300"}
+    if if_none_match is not None and etag in if_none_match:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
@@ -1,3 +1,5 @@
+from functools import cached_property
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,15 +15,46 @@ class Settings(BaseSettings):
 
     # Anthropic
     anthropic_api_key: str = ""
+    # Requests-per-minute budget for Anthropic calls (tier default: 50)
+    anthropic_rpm: int = 50
+    # Model for user-facing, latency-sensitive calls (suggestions, direct
+    # extraction) — point at a latency-optimized deployment where available.
+    # Batch extraction always uses the standard model.
+    anthropic_fast_model: str = "claude-haiku-4-5-20251001"
+    # Submit multi-item entity extraction via the Message Batches API
+    # (50% cheaper, but results can take minutes to come back)
+    extract_use_batches: bool = False
+    # Max in-flight Anthropic calls per /extract request (direct path)
+    extract_concurrency: int = 8
+    # Pool bulk analyze calls (per-item content suggestions) into Message
+    # Batches — same trade-off; interactive endpoints always call directly
+    analyze_use_batches: bool = False
+
+    # Embedding micro-batching: requests arriving within the window (ms) are
+    # embedded in one forward pass, up to this many texts
+    embed_batch_window_ms: float = 5.0
+    embed_max_batch: int = 64
+    # Forward passes running at once — the next batch is tokenized while the
+    # current one is in the model
+    embed_max_in_flight: int = 2
+    # ONNX Runtime intra-op threads for the embedding model (0 = half the
+    # cores, leaving room for the event loop and executor threads)
+    ort_intra_threads: int = 0
+    # OpenMP wait policy — PASSIVE stops idle worker threads spinning a core
+    ort_wait_policy: str = "PASSIVE"
 
     # Internal API security — Next.js sends this header when calling the engine
     engine_api_key: str = "changeme-in-production"
 
+    # Crawler HTML parser — "lxml" (default, fast) or "bs4" (BeautifulSoup)
+    html_parser: str = "lxml"
+
     # CORS — comma-separated list of allowed origins
     allowed_origins: str = "http://localhost:3000"
 
-    @property
+    @cached_property
     def origins_list(self) -> list[str]:
+        # Parsed on first access; settings are not reloaded at runtime
         return [o.strip() for o in self.allowed_origins.split(",") if o.strip()]
 
     model_config = SettingsConfigDict(
@@ -1,21 +1,59 @@
+import asyncio
+import importlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
+from agents.embedder import embed_batcher
+from api.analyze import close_client as close_analyze_client
+from api.analyze import fleet
 from api.analyze import router as analyze_router
+from api.chat import close_client as close_chat_client
 from api.chat import router as chat_router
 from api.crawl import router as crawl_router
+from api.embed import embedder_agent
 from api.embed import router as embed_router
 from api.extract import router as extract_router
+from api.health import mark_ready
 from api.health import router as health_router
 from api.search import router as search_router
+from api.search import search_agent
 from config import settings
 
+
+async def _warmup() -> None:
+    # Load the embedding model and run one pass, import the clustering
+    # backend (deferred at import time), then report ready
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, embedder_agent.warmup)
+    await loop.run_in_executor(None, importlib.import_module, "sklearn.cluster")
+    mark_ready()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Warm up in the background: /health answers at once, /ready (and the
+    # readiness probe) waits until the model is loaded
+    warmup = asyncio.create_task(_warmup())
+    async with search_agent, fleet, embed_batcher:
+        yield
+    warmup.cancel()
+    await close_analyze_client()
+    await close_chat_client()
+
+
 app = FastAPI(
     title="Visiblee Engine",
     description="Visiblee — Content Discovery & Analysis Service",
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
+    # Endpoints that return models are serialised by orjson, not stdlib json
+    default_response_class=ORJSONResponse,
 )
 
 # ─── CORS ─────────────────────────────────────────────────────────────────────
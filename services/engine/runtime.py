@@ -0,0 +1,19 @@
+"""
+ONNX Runtime tuning
+
+Process-wide settings for the embedding model's ONNX Runtime session.
+Import this before onnxruntime is loaded: the OpenMP wait policy is read
+from the environment once, when the runtime initialises its thread pools.
+"""
+
+import os
+
+from config import settings
+
+# An explicit environment value wins over the setting
+os.environ.setdefault("OMP_WAIT_POLICY", settings.ort_wait_policy)
+
+
+def intra_op_threads() -> int:
+    """Threads per forward pass: configured, else half the cores (min 1)."""
+    return settings.ort_intra_threads or max(1, (os.cpu_count() or 1) // 2)
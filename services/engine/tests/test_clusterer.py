@@ -0,0 +1,59 @@
+import asyncio
+
+import numpy as np
+
+from agents import clusterer
+from agents.clusterer import TopicClusterer
+
+
+class _SlowFit(TopicClusterer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    async def _fit(self, mat):  # type: ignore[override]
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return np.zeros(len(mat), dtype=np.int32), mat[:1], 1.0, 1
+
+
+def test_cancelled_leader_does_not_fail_waiters() -> None:
+    async def scenario() -> None:
+        clusterer._fit_cache.clear()
+        agent = _SlowFit()
+        mat = np.ones((4, 3), dtype=np.float32)
+
+        leader = asyncio.create_task(agent._fit_shared(mat))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(agent._fit_shared(mat))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        labels, _, _, k = await waiter
+
+        assert leader.cancelled()
+        assert k == 1 and len(labels) == 4
+        assert agent.calls == 1  # the waiter shared the leader's fit
+
+    asyncio.run(scenario())
+
+
+def test_failed_fit_is_not_cached() -> None:
+    class _Failing(_SlowFit):
+        async def _fit(self, mat):  # type: ignore[override]
+            self.calls += 1
+            raise ValueError("boom")
+
+    async def scenario() -> None:
+        clusterer._fit_cache.clear()
+        agent = _Failing()
+        mat = np.ones((4, 3), dtype=np.float32)
+        for _ in range(2):
+            try:
+                await agent._fit_shared(mat)
+            except ValueError:
+                pass
+        assert agent.calls == 2
+        assert not clusterer._fit_cache
+
+    asyncio.run(scenario())